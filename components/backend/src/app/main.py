@@ -5,6 +5,8 @@ import time
 from fastapi import FastAPI, Request
 from contextlib import asynccontextmanager
 from config.settings import get_settings
+from services.mongo import get_mongo_manager
+from services.solr_async import get_async_solr_manager
 from routers import ingest, metadata, search, admin
 from fastapi.middleware.cors import CORSMiddleware
 from config.logging import configure_logging, request_id_context
@@ -18,7 +20,13 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info(f"System startup. Environment: {settings.host}")
+    if settings.mongo_ensure_indexes:
+        try:
+            get_mongo_manager().ensure_indexes()
+        except Exception as e:
+            logger.error(f"Failed to ensure MongoDB indexes: {e}", exc_info=True)
     yield
+    await get_async_solr_manager().close()
     logger.info("System shutdown.")
 
 api = FastAPI(
@@ -1,11 +1,23 @@
 import typer
 import logging
+import statistics
+import time
 import uuid
 from pathlib import Path
+from typing import Optional
 from tasks.reindex import reindex_solr
+from tasks.rebuild import rebuild_solr_corpus, rollback_solr_rebuild
+from tasks.artifacts import reconcile_artifacts as reconcile_artifact_manifests
 from services.s3 import get_s3_manager
-from services.mongo import get_mongo_manager
+from services.solr import get_solr_manager
+import bson
+from services.mongo import (
+    get_mongo_manager, IndexCheckError, encode_subtitles, decode_segment,
+    SUBTITLE_FORMAT_DOCUMENTS, SUBTITLE_FORMAT_COLUMNAR,
+)
+from models.metadata import Segment
 from config.logging import configure_logging
+from config.settings import get_settings
 
 configure_logging()
 logger = logging.getLogger(__name__)
@@ -79,7 +91,7 @@ def upload_folder(folder_path: str):
             # 3. Upload to S3
             # We use the internal method or client directly
             print(f"   └── Uploading to S3 ({s3_key})")
-            s3.upload_file(str(file_path), s3_key)
+            mongo.record_artifact(media_id, s3.upload_file(str(file_path), s3_key))
 
         except Exception as e:
             logger.exception(f"Failed to process {filename}")
@@ -88,7 +100,7 @@ def upload_folder(folder_path: str):
     # 3. Verify upload
     print("   └── Verifying upload in S3...")
     try:
-        for key in s3.list_objects_by_prefix(media_id):
+        for key in s3.list_objects_by_prefix(f"{media_id}/"):
             print(f"   ✅ Uploaded: {key}")
     except Exception as e:
         logger.exception(f"Failed to verify upload for {path}")
@@ -109,5 +121,246 @@ def upload_folder(folder_path: str):
         logger.exception(f"Failed to register in mongodb upload for {path}")
         print(f"   ❌ Failed: {e}")
 
+@app.command()
+def rebuild_index(
+    workers: int = typer.Option(None, help="Parallel add requests (default from settings)"),
+    keep_previous: bool = typer.Option(False, "--keep-previous", help="Keep the old index for rollback-index"),
+):
+    """
+    Rebuilds the whole Solr index from MongoDB into a fresh core and swaps it live
+    (blue/green): no search downtime, editor changes in Mongo are kept.
+    """
+    try:
+        summary = rebuild_solr_corpus(workers=workers, keep_previous=keep_previous)
+    except Exception as e:
+        print(f"❌ Rebuild failed, live index unchanged: {e}")
+        raise typer.Exit(code=1)
+    print(
+        f"✅ Rebuilt {summary['documents']} documents of {summary['media']} media "
+        f"in {summary['seconds']}s ({summary['docs_per_second']} docs/s)"
+    )
+    if summary["previous_core"]:
+        print(f"   Previous index kept as core '{summary['previous_core']}'")
+
+
+@app.command()
+def rollback_index():
+    """
+    Swaps back to the index kept by 'rebuild-index --keep-previous'.
+    """
+    try:
+        rollback_solr_rebuild()
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise typer.Exit(code=1)
+    print("✅ Previous index is live again")
+
+
+@app.command()
+def refresh_facet_snapshot():
+    """
+    Recomputes the facet counts of the unfiltered search page (e.g. from cron).
+    """
+    snapshot = get_solr_manager().refresh_facet_snapshot()
+    if snapshot is None:
+        print("⏭️ Refresh already running, skipped.")
+        return
+    stale = " (writes pending, will be refreshed again)" if snapshot["generation"] is None else ""
+    print(f"✅ Facet snapshot refreshed: {snapshot['total']} documents, {len(snapshot['facets'])} facets{stale}")
+
+
+@app.command()
+def reconcile_artifacts(
+    media_id: Optional[str] = typer.Option(None, help="Only this media (default: all media)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only report the differences"),
+):
+    """
+    Brings the artifact manifests in MongoDB in line with the objects in S3
+    (e.g. for media uploaded before the manifest existed).
+    """
+    summary = reconcile_artifact_manifests([media_id] if media_id else None, dry_run=dry_run)
+    record, remove = ("Would record", "would remove") if dry_run else ("Recorded", "removed")
+    print(
+        f"✅ {record} {summary['added']} new and {summary['updated']} changed objects, "
+        f"{remove} {summary['removed']} stale entries ({summary['unchanged']} unchanged, {summary['media']} media)"
+    )
+    if summary["orphaned"]:
+        print(f"   ⚠️ S3 folders without media: {', '.join(summary['orphaned'])}")
+    if summary["failed"]:
+        print(f"   ❌ Failed for: {', '.join(summary['failed'])}")
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def ensure_indexes(check: bool = typer.Option(False, "--check", help="Verify the hot queries use an index scan")):
+    """
+    Creates the MongoDB indexes (idempotent) and optionally verifies the query plans.
+    """
+    mongo = get_mongo_manager()
+
+    print("Ensuring MongoDB indexes...")
+    for collection, names in mongo.ensure_indexes().items():
+        print(f"   ✅ {collection}: {', '.join(names)}")
+
+    if not check:
+        return
+
+    print("Checking query plans...")
+    try:
+        for query, stages in mongo.check_indexes().items():
+            print(f"   ✅ {query}: {' <- '.join(stages)}")
+    except IndexCheckError as e:
+        print(f"   ❌ {e}")
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def migrate_status_history():
+    """
+    Moves the embedded processing histories into the status events collection
+    and caps the history kept on the media documents.
+    """
+    mongo = get_mongo_manager()
+    print("Migrating processing histories...")
+    counts = mongo.migrate_processing_history()
+    print(f"   ✅ Capped {counts['media']} media documents, copied {counts['events']} status events.")
+
+
+@app.command()
+def migrate_subtitle_format(
+    to: str = typer.Option(SUBTITLE_FORMAT_COLUMNAR, help="Target format: 'documents' or 'columnar'"),
+):
+    """
+    Rewrites the stored segment subtitles into the given format.
+    Set MONGO_SUBTITLE_FORMAT to the same value so new writes use it too.
+    """
+    mongo = get_mongo_manager()
+    print(f"Migrating segment subtitles to '{to}' format...")
+    try:
+        modified = mongo.migrate_subtitle_format(to)
+    except ValueError as e:
+        print(f"   ❌ {e}")
+        raise typer.Exit(code=1)
+    print(f"   ✅ Rewrote {modified} segments.")
+
+
+@app.command()
+def benchmark_subtitle_format(
+    segments: int = typer.Option(2000, help="Number of segments of the synthetic debate"),
+    subtitles: int = typer.Option(10, help="Number of subtitles per segment and type"),
+    runs: int = typer.Option(5, help="Number of timed runs per format"),
+):
+    """
+    Compares BSON size and decode + validation time of the subtitle storage formats.
+    Runs in memory, no database access.
+    """
+    synthetic = _synthetic_segments(segments, subtitles)
+
+    for subtitle_format in (SUBTITLE_FORMAT_DOCUMENTS, SUBTITLE_FORMAT_COLUMNAR):
+        stored = []
+        for seg in synthetic:
+            encoded = encode_subtitles(seg["subtitles"], subtitle_format)
+            stored.append(bson.encode({
+                "media_id": "benchmark",
+                "segment_nr": seg["segment_nr"],
+                "speaker_id": seg["speaker_id"],
+                "start": seg["start"],
+                "end": seg["end"],
+                "subtitles_original": encoded,
+                "subtitles_translation": encoded,
+            }))
+
+        timings = []
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            for raw in stored:
+                Segment.model_validate(decode_segment(bson.decode(raw)))
+            timings.append((time.perf_counter() - start_time) * 1000)
+
+        size = sum(len(raw) for raw in stored)
+        print(
+            f"   {subtitle_format:<10} size={size / 1024:10.1f}KiB "
+            f"decode+validate median={statistics.median(timings):8.1f}ms"
+        )
+
+
+@app.command()
+def benchmark_metadata(
+    segments: int = typer.Option(2000, help="Number of segments of the synthetic debate"),
+    subtitles: int = typer.Option(10, help="Number of subtitles per segment and type"),
+    runs: int = typer.Option(20, help="Number of timed runs per implementation"),
+):
+    """
+    Compares the aggregation and the three-query get_full_metadata on a synthetic long debate.
+    The synthetic debate is removed afterwards.
+    """
+    mongo = get_mongo_manager()
+    settings = get_settings()
+    media_id = f"benchmark-{uuid.uuid4()}"
+
+    print(f"Creating synthetic debate {media_id}: {segments} segments x {subtitles} subtitles...")
+    mongo.insert_initial_media_document(
+        media_id=media_id,
+        s3_key=f"{media_id}/source.mp4",
+        filename="benchmark.mp4",
+        media_type="video",
+        status="benchmark",
+    )
+    mongo.save_speakers(media_id, {f"SPEAKER_{i:02d}" for i in range(12)})
+
+    synthetic = _synthetic_segments(segments, subtitles)
+    for subtitle_type in (settings.type_original, settings.type_translation):
+        mongo.save_segments_bulk(media_id=media_id, subtitle_type=subtitle_type, segments=synthetic)
+
+    implementations = {
+        "sequential (3 queries)": lambda: mongo.get_full_metadata_sequential(media_id),
+        "aggregation": lambda: mongo.get_full_metadata(media_id),
+        "aggregation (original only)": lambda: mongo.get_full_metadata(
+            media_id, subtitle_types=[settings.type_original]
+        ),
+    }
+
+    try:
+        for label, fetch in implementations.items():
+            fetch()  # warm up
+            timings = []
+            for _ in range(runs):
+                start_time = time.perf_counter()
+                fetch()
+                timings.append((time.perf_counter() - start_time) * 1000)
+            timings.sort()
+            p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+            print(
+                f"   {label:<28} mean={statistics.mean(timings):8.1f}ms "
+                f"median={statistics.median(timings):8.1f}ms p95={p95:8.1f}ms"
+            )
+    finally:
+        mongo.delete_everything(media_id)
+        print(f"Removed synthetic debate {media_id}")
+
+
+def _synthetic_segments(segment_count: int, subtitle_count: int):
+    """Builds parser-shaped segments with alternating speakers and 3s subtitles."""
+    result = []
+    current_time = 0.0
+    for nr in range(1, segment_count + 1):
+        subs = []
+        for i in range(subtitle_count):
+            subs.append({
+                "start": current_time,
+                "end": current_time + 3.0,
+                "text": f"Synthetic statement {nr}.{i} with some words to resemble a transcript line.",
+            })
+            current_time += 3.0
+        result.append({
+            "segment_nr": nr,
+            "speaker_id": f"SPEAKER_{nr % 12:02d}",
+            "start": subs[0]["start"],
+            "end": subs[-1]["end"],
+            "subtitles": subs,
+        })
+    return result
+
+
 if __name__ == "__main__":
     app()
@@ -14,6 +14,13 @@ class Settings(BaseSettings):
     s3_bucket_name: str
     s3_public_url: str
     s3_signing_url: str
+    # Presigned URL cache (in-process, per API worker)
+    s3_url_cache_max_entries: int = 10000
+    s3_url_cache_max_bytes: int = 16 * 1024 * 1024
+    # Cached URLs are served until this many seconds before they expire (playable URLs: half their lifetime)
+    s3_url_expiry_margin: int = 300
+    # Signed URL set of a media (player): new files of the media appear after at most this delay
+    s3_url_set_ttl: float = 300.0
 
     # Mongo Config
     mongo_url: str
@@ -22,9 +29,68 @@ class Settings(BaseSettings):
     mongo_subtitle_collection: str
     mongo_speaker_collection: str
     mongo_segment_collection: str
+    mongo_status_event_collection: str = "status_events"
+    # Manifest of the S3 objects (artifacts) of each media
+    mongo_artifact_collection: str = "artifacts"
+    mongo_status_events_timeseries: bool = False
+    processing_history_limit: int = 20
+    # Storage format of the segment subtitles: "documents" or "columnar"
+    mongo_subtitle_format: str = "documents"
+    mongo_bulk_chunk_size: int = 500
+    mongo_ensure_indexes: bool = True
+
+    # Metadata Cache (in-process, per API worker)
+    metadata_cache_max_entries: int = 256
+    metadata_cache_max_bytes: int = 64 * 1024 * 1024
+    metadata_cache_ttl: float = 60.0
 
     # Solr Config
     solr_url: str
+    # Commit strategy of all Solr writes: "hard", "soft" or "commit_within"
+    solr_commit_strategy: str = "commit_within"
+    solr_commit_within_ms: int = 1000
+    # Editor writes are made visible immediately (soft commit) for read-your-writes
+    solr_editor_read_your_writes: bool = True
+    # Documents per add request for media-wide updates
+    solr_update_chunk_size: int = 1000
+    # Must match autoSoftCommit maxTime in solrconfig.xml: visibility delay of uncommitted writes
+    solr_auto_soft_commit_ms: int = 3000
+    # Index one document per subtitle next to each segment, for exact hit timestamps
+    solr_subtitle_documents: bool = False
+    # Max matching subtitles returned per segment
+    solr_subtitle_hits_per_segment: int = 5
+    # Speaker fields are not indexed but resolved from Mongo at query time:
+    # speaker edits no longer rewrite the segment documents
+    solr_query_time_speakers: bool = False
+    # Block join layout: one debate parent document per media holds the debate fields,
+    # the segments are its children (requires a full reindex when switched).
+    # Facets on debate fields then count matching debates instead of matching segments.
+    solr_debate_parents: bool = False
+    # Blue/green rebuild: configset of the fresh core, name of the core swapped out, add threads
+    solr_configset: str = "debates"
+    solr_rebuild_core_suffix: str = "_rebuild"
+    solr_rebuild_workers: int = 4
+    # Async search client: keep-alive connection pool per API worker
+    solr_http_pool_size: int = 20
+    solr_http_connect_timeout: float = 2.0
+    solr_http_read_timeout: float = 10.0
+    solr_http_keepalive_expiry: float = 30.0
+    # Retries of idempotent requests (searches) on connection errors and 502/503/504
+    solr_http_retries: int = 2
+
+    # Search result cache (Redis), invalidated by every Solr write
+    search_cache_enabled: bool = True
+    search_cache_ttl: int = 300
+    # Max time other workers wait for a concurrent computation of the same query
+    search_cache_lock_ms: int = 5000
+    # Added to the visibility delay of a write: time for Solr to open and warm the new searcher
+    search_cache_visibility_margin_ms: int = 2000
+    # Serve the facets of the unfiltered search from a precomputed snapshot
+    facet_snapshot_enabled: bool = True
+    # Bounds of the range facets: debate_date (Solr date math) and start/end (seconds)
+    facet_date_range_start: str = "2000-01-01T00:00:00Z"
+    facet_date_range_end: str = "NOW/DAY+1DAY"
+    facet_time_range_end: float = 8 * 3600
 
     # Redis
     redis_url: str
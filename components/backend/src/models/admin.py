@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Dict
 from datetime import datetime
 
 
@@ -22,11 +22,25 @@ class MediaListItem(BaseModel):
 # routes/admin.py
 # ---------------------------------
 
+# processing history response model
+
+class StatusEvent(ProcessingStep):
+    job_id: Optional[str] = None
+
+
+class ProcessingHistoryResponse(BaseModel):
+    media_id: str
+    events: List[StatusEvent]
+
+
 # list media response model
 
 class MediaListResponse(BaseModel):
     items: List[MediaListItem]
-    total: int
+    # Number of media over all pages, returned with the first page only
+    total: Optional[int] = None
+    # Cursor of the next page, None on the last page
+    next_cursor: Optional[str] = None
 
 # list media request/response model
 
@@ -52,3 +66,33 @@ class ReindexMediaResponse(BaseModel):
     mediaId: str
     warnings: Optional[List[str]] = None
     errors: Optional[List[str]] = None
+
+
+# cache stats response model
+
+class CacheStats(BaseModel):
+    entries: int
+    bytes: int
+    max_entries: int
+    max_bytes: int
+    ttl: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    invalidations: int
+
+
+class SearchCacheStats(BaseModel):
+    enabled: bool
+    generation: int
+    hits: int
+    misses: int
+    coalesced: int
+    hit_rate: float
+    saved_ms: float
+
+
+class CacheStatsResponse(BaseModel):
+    caches: Dict[str, CacheStats]
+    search_cache: Optional[SearchCacheStats] = None
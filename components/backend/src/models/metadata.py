@@ -73,6 +73,9 @@ class Segment(BaseModel):
     speaker_id: Optional[str]
     subtitles_original: List[Subtitle] = []
     subtitles_translation: List[Subtitle] = []
+    # Edit versions of the subtitle lists, sent back as expected_version on update
+    version_original: int = 0
+    version_translation: int = 0
 
 
 class DebateDocument(DebateOperational, DebateOptional):
@@ -102,6 +105,13 @@ class MetadataResponse(BaseModel):
     segments: List[Segment] = []
 
 
+# get segments response model
+
+class SegmentsResponse(BaseModel):
+    media_id: str
+    segments: List[Segment] = []
+
+
 # update metadata request models
 
 class UpdateSpeakersRequest(BaseModel):
@@ -114,6 +124,21 @@ class UpdateSubtitlesRequest(BaseModel):
     segment_nr: int
     subtitles: List[Subtitle]
     subtitle_type: SubtitleType
+    expected_version: Optional[int] = Field(
+        None, description="Edit version of the segment subtitles as loaded, to detect concurrent edits"
+    )
+
+
+class SegmentSubtitles(BaseModel):
+    segment_nr: int
+    subtitles: List[Subtitle]
+    expected_version: Optional[int] = None
+
+
+class UpdateSubtitlesBatchRequest(BaseModel):
+    media_id: str
+    subtitle_type: SubtitleType
+    segments: List[SegmentSubtitles]
 
 
 class UpdateDebateRequest(DebateKey, DebateOptional):
@@ -125,3 +150,8 @@ class UpdateDebateRequest(DebateKey, DebateOptional):
 class UpdateMetadataResponse(BaseModel):
     status: str
     media_id: str
+
+
+class UpdateSubtitlesResponse(UpdateMetadataResponse):
+    # New edit version of each updated segment
+    versions: Dict[int, int] = {}
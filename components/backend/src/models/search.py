@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Optional
 from datetime import datetime
 from enum import Enum
@@ -9,6 +9,12 @@ class FacetFilter(BaseModel):
     facetValue: str = Field(..., description="Solr facet field value", examples=["translation"])
 
 
+class DateGap(str, Enum):
+    day = "day"
+    month = "month"
+    year = "year"
+
+
 class SearchQuery(BaseModel):
     queryTerm: str = Field(..., description="Solr query term can be empty", examples=["honor"])
     sortBy: str = Field(..., description="Solr sort option", examples=["start asc"])
@@ -21,6 +27,31 @@ class SearchQuery(BaseModel):
     )
     start: int = Field(0, description="Pagination start index", examples=[0])
     rows: int = Field(10, description="Number of rows to return", examples=[10])
+    fields: Optional[List[str]] = Field(
+        None, description="Additional stored fields to return (fl)", examples=[["speaker_name"]]
+    )
+    highlightFields: Optional[List[str]] = Field(
+        None, description="Fields to highlight (hl.fl)", examples=[["statement"]]
+    )
+    highlightSnippets: Optional[int] = Field(None, description="Snippets per field (hl.snippets)", examples=[3])
+    highlightFragsize: Optional[int] = Field(
+        None, description="Snippet size in characters, 0 returns whole values (hl.fragsize)", examples=[160]
+    )
+    compact: bool = Field(False, description="Return only ids, timings, speaker fields and snippets")
+    cursor: Optional[str] = Field(
+        None, description="Deep paging cursor (cursorMark): '*' for the first page, then nextCursor", examples=["*"]
+    )
+    dateGap: Optional[DateGap] = Field(
+        None, description="Range facet on debate_date with this bucket size, replaces its term facet", examples=["month"]
+    )
+    timeBucket: Optional[float] = Field(
+        None, description="Range facets on start and end with buckets of this many seconds", examples=[300]
+    )
+    nestedFacets: List[str] = Field(
+        [], description="Nested term facets as 'parent>child'", examples=[["debate_session>speaker_name"]]
+    )
+    subtitleHits: bool = Field(False, description="Return the timestamps of the matching subtitles per segment")
+    filterQueries: List[str] = Field([], description="Additional Solr filter queries resolved by the API")
 
 
 class StatementType(str, Enum):
@@ -38,11 +69,38 @@ class FacetField(BaseModel):
     values: List[FacetValue]
 
 
+class SubtitleHit(BaseModel):
+    start: float
+    end: float
+    text: str
+
+
+class FacetBucket(BaseModel):
+    value: str
+    count: int
+    # Sub-facets computed within this bucket
+    facets: List["JsonFacet"] = []
+
+
+class JsonFacet(BaseModel):
+    name: str
+    buckets: List[FacetBucket]
+
+
+FacetBucket.model_rebuild()
+
+
 class HighlightedDoc(BaseModel):
+    # Snippets of other fields requested with 'highlightFields' are passed through
+    model_config = ConfigDict(extra="allow")
+
     statement: Optional[List[str]] = None
 
 
 class SearchDocument(BaseModel):
+    # Extra stored fields requested with 'fields' are passed through
+    model_config = ConfigDict(extra="allow")
+
     id: str
     media_id: str
     segment_nr: int
@@ -57,14 +115,57 @@ class SearchDocument(BaseModel):
     statement_language: Optional[str]= None
 
 
+class SubtitleDocument(BaseModel):
+    """One subtitle of a segment, indexed with its own timestamps (optional indexing mode)."""
+    id: str
+    doc_type: str = "subtitle"
+    segment_id: str
+    media_id: str
+    segment_nr: int
+    statement: List[str]
+    statement_type: StatementType
+    start: float
+    end: float
+
+
 # ---------------------------------
 # routes/search.py
 # ---------------------------------
 
 # search response model
 
+class FacetSnapshotInfo(BaseModel):
+    computed_at: datetime
+    age_seconds: float
+    stale: bool = Field(..., description="The index changed since the facet counts were computed")
+
+
+class CompactSearchHit(BaseModel):
+    id: str
+    media_id: str
+    segment_nr: int
+    start: float
+    end: float
+    speaker_id: str
+    speaker_name: Optional[str] = None
+    # multi-valued in the Solr schema
+    speaker_role_tag: Optional[List[str]] = None
+    speaker_country: Optional[List[str]] = None
+    snippets: List[str] = []
+
+
 class SearchResponse(BaseModel):
     docs: List[SearchDocument]
     total: int
     facets: List[FacetField] = []
+    # Range and nested facets (JSON Facet API)
+    json_facets: List[JsonFacet] = []
     highlighting: Dict[str, HighlightedDoc] = {}
+    # Set when the facets come from the precomputed snapshot of the unfiltered search
+    facets_snapshot: Optional[FacetSnapshotInfo] = None
+    # Compact mode: hits replace docs and highlighting
+    hits: Optional[List[CompactSearchHit]] = None
+    # Matching subtitles per segment id, ordered by start (subtitleHits)
+    subtitle_hits: Dict[str, List[SubtitleHit]] = {}
+    # Cursor mode: cursor of the next page, None on the last page
+    nextCursor: Optional[str] = None
@@ -1,11 +1,16 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from models.admin import (
     MediaListResponse, MediaListItem, ReindexMediaRequest,
-    DeleteMediaRequest, DeleteMediaResponse, ReindexMediaResponse
+    DeleteMediaRequest, DeleteMediaResponse, ReindexMediaResponse,
+    CacheStatsResponse, ProcessingHistoryResponse
 )
-from services.mongo import get_mongo_manager, MongoManager
+from services.mongo import DocumentNotFoundError
+from services.mongo_async import get_async_mongo_manager, AsyncMongoManager
 from services.s3 import get_s3_manager, S3Manager
+from services.cache import get_metadata_cache, get_presigned_url_cache
+from services.search_cache import get_search_cache
 from services.solr import get_solr_manager, SolrManager
 from tasks.reindex import reindex_solr
 from pymongo.errors import PyMongoError, ServerSelectionTimeoutError, ConnectionFailure
@@ -17,15 +22,24 @@ router = APIRouter()
 
 @router.get("/list", response_model=MediaListResponse)
 async def list_media(
-    mongo: MongoManager = Depends(get_mongo_manager)
+    limit: int = Query(50, ge=1, le=500, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as 'next_cursor' by the previous page"),
+    status: Optional[str] = Query(None, description="Only return media with this status"),
+    history_limit: int = Query(5, ge=0, le=100, description="Number of most recent processing steps to return"),
+    mongo: AsyncMongoManager = Depends(get_async_mongo_manager)
 ):
     """
-    Returns a list of all uploaded media for the dashboard.
+    Returns a page of uploaded media for the dashboard, newest first.
     """
-    logger.info("Listing all media items from MongoDB")
+    logger.info(f"Listing media items from MongoDB: limit={limit}, status={status}, cursor={cursor}")
 
     try:
-        docs = mongo.get_all_media()
+        docs, next_cursor = await mongo.list_media(
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            history_limit=history_limit,
+        )
 
         items = []
         for d in docs:
@@ -38,10 +52,17 @@ async def list_media(
                 created_at=d.get("created_at"),
                 title=d.get("title")
             ))
-            logger.info(f"Added media item: {items[-1]}")
+
+        # First page only: later pages keep the total of the first
+        total = await mongo.count_media(status) if cursor is None else None
 
         logger.info(f"Dashboard list requested. Returning {len(items)} items.")
-        return MediaListResponse(items=items, total=len(items))
+        return MediaListResponse(items=items, total=total, next_cursor=next_cursor)
+
+    # Catch invalid cursors (Client-side issue)
+    except ValueError as e:
+        logger.warning(f"Invalid list request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Catch Connection Issues (DB Down / Timeout)
     except (ServerSelectionTimeoutError, ConnectionFailure) as e:
@@ -61,16 +82,36 @@ async def list_media(
 
     # Catch Logic Issues
     except Exception as e:
-        logger.exception(f"Unexpected logic error in list_media: {e}, doc: {d}")
+        logger.exception(f"Unexpected logic error in list_media: {e}")
         raise HTTPException(
             status_code=500,
             detail="Internal Server Error"
         )
 
+@router.get("/history", response_model=ProcessingHistoryResponse)
+async def processing_history(
+    media_id: str = Query(..., description="The UUID of the media"),
+    mongo: AsyncMongoManager = Depends(get_async_mongo_manager)
+):
+    """
+    Returns the full processing history of a media from the status events.
+    The dashboard listing only carries the most recent steps.
+    """
+    logger.info(f"media_id={media_id} - GET processing history request received.")
+
+    try:
+        events = await mongo.get_status_events(media_id)
+    except Exception:
+        logger.exception(f"media_id={media_id} - Failed to fetch processing history.")
+        raise HTTPException(status_code=500, detail="Database error")
+
+    return {"media_id": media_id, "events": events}
+
+
 @router.post("/delete", response_model=DeleteMediaResponse)
 async def delete_media(
     request: DeleteMediaRequest,
-    mongo: MongoManager = Depends(get_mongo_manager),
+    mongo: AsyncMongoManager = Depends(get_async_mongo_manager),
     s3: S3Manager = Depends(get_s3_manager),
     solr: SolrManager = Depends(get_solr_manager),
 ):
@@ -101,7 +142,7 @@ async def delete_media(
 
     # Try MongoDB (Hard Fail)
     try:
-        deleted = mongo.delete_everything(media_id)
+        deleted = await mongo.delete_everything(media_id)
         if not deleted:
             logger.warning(f"media_id={media_id} - Not found in MongoDB during delete.")
             raise HTTPException(status_code=404, detail="Media not found in DB")
@@ -132,7 +173,7 @@ async def delete_media(
 async def reindex_media(
     request: ReindexMediaRequest,
     background_tasks: BackgroundTasks,
-    mongo_client: MongoManager = Depends(get_mongo_manager)
+    mongo_client: AsyncMongoManager = Depends(get_async_mongo_manager)
 ):
     """
     Triggers the Solr Indexing process manually.
@@ -142,11 +183,27 @@ async def reindex_media(
     logger.info(f"media_id={media_id} - REINDEX request received.")
 
     # 1. Validate ID exists
-    debate = mongo_client.get_debate_metadata(media_id)
-    if not debate:
+    try:
+        await mongo_client.get_debate_metadata(media_id)
+    except DocumentNotFoundError:
         logger.warning(f"media_id={media_id} - Reindex rejected. Media ID not found.")
         raise HTTPException(status_code=404, detail="Media not found")
 
     background_tasks.add_task(reindex_solr, media_id)
     logger.info(f"media_id={media_id} - Reindex task queued in background.")
     return {"status": "indexing_started", "mediaId": media_id}
+
+
+@router.get("/cache-stats", response_model=CacheStatsResponse)
+async def cache_stats():
+    """
+    Returns hit/miss/eviction counters of the in-process caches of this API worker
+    and the counters of the search result cache shared by all workers.
+    """
+    return {
+        "caches": {
+            "metadata": get_metadata_cache().stats(),
+            "presigned_urls": get_presigned_url_cache().stats(),
+        },
+        "search_cache": await get_search_cache().stats(),
+    }
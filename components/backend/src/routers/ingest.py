@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from services.s3 import get_s3_manager, S3Manager
 from services.queue import get_queue_manager, QueueManager
 from services.mongo import get_mongo_manager, MongoManager
+from services.mongo_async import get_async_mongo_manager, AsyncMongoManager
 from models.ingest import S3PostRequest, S3PostResponse, ProcessRequest, FileType
 from services.reporter import JobReporter
 
@@ -16,7 +17,7 @@ router = APIRouter()
 async def get_presigned_post(
     request_data: S3PostRequest,
     s3_client: S3Manager = Depends(get_s3_manager),
-    mongo_client: MongoManager = Depends(get_mongo_manager),
+    mongo_client: AsyncMongoManager = Depends(get_async_mongo_manager),
 ):
     """
     [POST] Returns a presigned URL and creates the initial Mongodb record.
@@ -52,7 +53,7 @@ async def get_presigned_post(
         raise HTTPException(status_code=500, detail="Storage service unavailable.")
 
     try:
-        mongo_client.insert_initial_media_document(
+        await mongo_client.insert_initial_media_document(
             media_id=media_id,
             s3_key=s3_key,
             filename=filename,
@@ -82,13 +83,14 @@ def _is_audio_file(filename: str) -> bool:
 
 
 @router.post("/process")
-async def start_processing(
+def start_processing(
     request: ProcessRequest,
     rq: QueueManager = Depends(get_queue_manager),
     mongo: MongoManager = Depends(get_mongo_manager),
 ):
     """
     [POST] Starts processing: starts redis queue with first task.
+    Sync handler (run in the threadpool): rq and the job reporter use blocking clients.
     """
     media_id = request.media_id
     file_type = request.file_type
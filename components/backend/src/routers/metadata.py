@@ -1,11 +1,15 @@
 import logging
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Depends, Query
-from services.mongo import get_mongo_manager, MongoManager, DocumentNotFoundError
+from fastapi.concurrency import run_in_threadpool
+from services.mongo import get_mongo_manager, MongoManager, DocumentNotFoundError, SegmentVersionConflictError
+from services.mongo_async import get_async_mongo_manager, AsyncMongoManager
 from services.s3 import get_s3_manager, S3Manager
 from services.solr import get_solr_manager, SolrManager
 from models.metadata import (
-    MetadataResponse, UpdateMetadataResponse, UpdateDebateRequest,
-    UpdateSpeakersRequest, UpdateSubtitlesRequest, MediaType, S3MediaUrlResponse
+    MetadataResponse, UpdateMetadataResponse, UpdateSubtitlesResponse, UpdateDebateRequest,
+    UpdateSpeakersRequest, UpdateSubtitlesRequest, MediaType, S3MediaUrlResponse,
+    SubtitleType, SegmentsResponse, UpdateSubtitlesBatchRequest
 )
 
 logger = logging.getLogger(__name__)
@@ -17,7 +21,7 @@ router = APIRouter()
 async def get_media_urls(
     media_id: str = Query(..., description="The UUID of the media"),
     s3_client: S3Manager = Depends(get_s3_manager),
-    mongo_client: MongoManager = Depends(get_mongo_manager),
+    mongo_client: AsyncMongoManager = Depends(get_async_mongo_manager),
 ):
     """
     Get signed media urls for a debate.
@@ -27,58 +31,72 @@ async def get_media_urls(
 
     # Fetch Metadata
     try:
-        debate = mongo_client.get_debate_metadata(media_id)
-        if not debate:
-            logger.warning(f"media_id={media_id} - Metadata not found in MongoDB.")
-            raise HTTPException(status_code=404, detail="Media not found")
-    except Exception as e:
-        if isinstance(e, HTTPException):
-            raise e
+        debate = await mongo_client.get_debate_metadata(media_id)
+    except DocumentNotFoundError:
+        logger.warning(f"media_id={media_id} - Metadata not found in MongoDB.")
+        raise HTTPException(status_code=404, detail="Media not found")
+    except Exception:
         logger.exception(f"media_id={media_id} - Failed to fetch metadata from MongoDB.")
         raise HTTPException(status_code=500, detail="Database error")
 
-    # List Files from S3
+    # Files from the artifact manifest: no S3 listing on reads
     try:
-        file_keys = s3_client.list_objects_by_prefix(f"{media_id}")
-        logger.info(f"media_id={media_id} - Found {len(file_keys)} files in S3.")
+        artifacts = await mongo_client.get_artifacts(media_id)
     except Exception:
-        logger.exception(f"media_id={media_id} - Failed to list objects from S3.")
-        raise HTTPException(status_code=500, detail="Storage service unavailable.")
-
-    # Generate URLs
-    download_urls = []
+        logger.exception(f"media_id={media_id} - Failed to fetch artifact manifest from MongoDB.")
+        raise HTTPException(status_code=500, detail="Database error")
 
     # Default to video if missing
     media_type = debate.get("media_type", MediaType.video.value)
-    media_url = ""
 
-    for object_key in file_keys:
-        try:
-            filename = _get_file_name_from_s3_key(object_key)
-            url = s3_client.get_presigned_url(object_key, as_attachment=True)
-
-            download_urls.append({
-                "url": url,
-                "label": filename
-            })
-
-            if _is_audio_file(filename) and media_type == MediaType.audio.value:
-                media_url = s3_client.get_presigned_url(object_key, as_attachment=False)
-            elif _is_video_file(filename) and media_type == MediaType.video.value:
-                media_url = s3_client.get_presigned_url(object_key, as_attachment=False)
-        except Exception as e:
-            # Log specific signing failure, but don't crash the whole request
-            logger.error(f"media_id={media_id} - Failed to sign URL for key '{object_key}': {e}")
-
-    if not media_url:
-        logger.warning(f"media_id={media_id} - No playable media found matching type '{media_type}'")
-
-    logger.info(f"media_id={media_id} - Returning {len(download_urls)} signed URLs.")
-
-    return {
-        "signedUrls": download_urls,
-        "signedMediaUrl": media_url,
-    }
+    def build_urls(sign):
+        if artifacts:
+            file_keys = [artifact["key"] for artifact in artifacts]
+            logger.info(f"media_id={media_id} - Found {len(file_keys)} files in the manifest.")
+        else:
+            # Media without manifest (run 'reconcile-artifacts'): list its folder in S3
+            try:
+                file_keys = s3_client.list_objects_by_prefix(f"{media_id}/")
+                logger.warning(f"media_id={media_id} - No artifact manifest, found {len(file_keys)} files in S3.")
+            except Exception:
+                logger.exception(f"media_id={media_id} - Failed to list objects from S3.")
+                raise HTTPException(status_code=500, detail="Storage service unavailable.")
+
+        # Generate URLs
+        download_urls = []
+        media_url = ""
+
+        for object_key in file_keys:
+            try:
+                filename = _get_file_name_from_s3_key(object_key)
+                url = sign(object_key, as_attachment=True)
+
+                download_urls.append({
+                    "url": url,
+                    "label": filename
+                })
+
+                if _is_audio_file(filename) and media_type == MediaType.audio.value:
+                    media_url = sign(object_key, as_attachment=False)
+                elif _is_video_file(filename) and media_type == MediaType.video.value:
+                    media_url = sign(object_key, as_attachment=False)
+            except Exception as e:
+                # Log specific signing failure, but don't crash the whole request
+                logger.error(f"media_id={media_id} - Failed to sign URL for key '{object_key}': {e}")
+
+        if not media_url:
+            logger.warning(f"media_id={media_id} - No playable media found matching type '{media_type}'")
+
+        return {
+            "signedUrls": download_urls,
+            "signedMediaUrl": media_url,
+        }
+
+    # Listing and signing are skipped while the signed URL set of the media is cached
+    url_set = s3_client.get_media_url_set(media_id, media_type, build_urls)
+    logger.info(f"media_id={media_id} - Returning {len(url_set['signedUrls'])} signed URLs.")
+
+    return url_set
 
 
 def _get_file_name_from_s3_key(s3_key: str) -> str:
@@ -96,13 +114,21 @@ def _is_video_file(file_key) -> bool:
 @router.get("/get-metadata", response_model=MetadataResponse)
 async def mongo_metadata(
     media_id: str = Query(..., description="The UUID of the media"),
-    mongo_client: MongoManager = Depends(get_mongo_manager),
+    subtitle_types: List[SubtitleType] = Query(
+        [SubtitleType.transcript, SubtitleType.translation],
+        alias="subtitleTypes",
+        description="Subtitle types to return with the segments"
+    ),
+    mongo_client: AsyncMongoManager = Depends(get_async_mongo_manager),
 ):
     logger.info(f"media_id={media_id} - GET metadata request received.")
 
     try:
         # Fetch full metadata from MongoDB
-        metadata = mongo_client.get_full_metadata(media_id)
+        metadata = await mongo_client.get_full_metadata(
+            media_id,
+            subtitle_types=[t.value for t in subtitle_types],
+        )
 
         seg_count = len(metadata.get("segments", []) or [])
         spk_count = len(metadata.get("speakers", []) or [])
@@ -120,10 +146,62 @@ async def mongo_metadata(
         raise HTTPException(status_code=500, detail="Database error")
 
 
+@router.get("/get-segments", response_model=SegmentsResponse)
+async def get_segments(
+    media_id: str = Query(..., description="The UUID of the media"),
+    from_time: Optional[float] = Query(None, ge=0, description="Start of the time window in seconds"),
+    to_time: Optional[float] = Query(None, ge=0, description="End of the time window in seconds"),
+    from_segment: Optional[int] = Query(None, ge=1, description="First segment_nr of the range"),
+    to_segment: Optional[int] = Query(None, ge=1, description="Last segment_nr of the range"),
+    subtitle_types: List[SubtitleType] = Query(
+        [SubtitleType.transcript, SubtitleType.translation],
+        alias="subtitleTypes",
+        description="Subtitle types to return with the segments"
+    ),
+    mongo_client: AsyncMongoManager = Depends(get_async_mongo_manager),
+):
+    """
+    Returns only the segments of a time window or of a segment_nr range,
+    so the player can load the region around the playback position lazily.
+    """
+    by_time = from_time is not None and to_time is not None
+    by_range = from_segment is not None and to_segment is not None
+
+    if by_time == by_range:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide either from_time and to_time or from_segment and to_segment."
+        )
+
+    types = [t.value for t in subtitle_types]
+
+    try:
+        if by_time:
+            if to_time < from_time:
+                raise HTTPException(status_code=400, detail="to_time must not be before from_time.")
+            logger.info(f"media_id={media_id} - GET segments request. Window={from_time}-{to_time}s")
+            segments = await mongo_client.get_segments_in_window(media_id, from_time, to_time, types)
+        else:
+            if to_segment < from_segment:
+                raise HTTPException(status_code=400, detail="to_segment must not be before from_segment.")
+            logger.info(f"media_id={media_id} - GET segments request. Range={from_segment}-{to_segment}")
+            segments = await mongo_client.get_segments_by_range(media_id, from_segment, to_segment, types)
+
+        logger.info(f"media_id={media_id} - Returning {len(segments)} segments.")
+        return {"media_id": media_id, "segments": segments}
+
+    except HTTPException:
+        raise
+
+    except Exception:
+        logger.exception(f"media_id={media_id} - CRITICAL: Failed to fetch segments.")
+        raise HTTPException(status_code=500, detail="Database error")
+
+
 @router.post("/update-speakers", response_model=UpdateMetadataResponse)
 async def update_speakers(
     request: UpdateSpeakersRequest,
-    mongo_client: MongoManager = Depends(get_mongo_manager),
+    mongo_client: AsyncMongoManager = Depends(get_async_mongo_manager),
     solr_client: SolrManager = Depends(get_solr_manager),
 ):
     """
@@ -137,15 +215,17 @@ async def update_speakers(
     speakers_data = [s.dict() for s in request.speakers]
 
     try:
-        mongo_client.update_speakers(media_id, speakers_data)
+        await mongo_client.update_speakers(media_id, speakers_data)
 
         logger.info(f"media_id={media_id} - MongoDB speakers updated successfully.")
 
-        solr_client.update_speakers(
+        # Blocking Solr (and Mongo, for debate blocks) calls: off the event loop
+        updated = await run_in_threadpool(
+            solr_client.update_speakers,
             media_id=media_id,
             speakers=speakers_data
         )
-        logger.info(f"media_id={media_id} - Solr index synced successfully.")
+        logger.info(f"media_id={media_id} - Solr index synced successfully. Updated {updated} documents.")
 
         return {"status": "success", "media_id": media_id}
 
@@ -157,10 +237,10 @@ async def update_speakers(
         raise HTTPException(status_code=500, detail="Error updating speakers")
 
 
-@router.post("/update-subtitles", response_model=UpdateMetadataResponse)
+@router.post("/update-subtitles", response_model=UpdateSubtitlesResponse)
 async def update_subtitles(
     request: UpdateSubtitlesRequest,
-    mongo_client: MongoManager = Depends(get_mongo_manager),
+    mongo_client: AsyncMongoManager = Depends(get_async_mongo_manager),
     solr_client: SolrManager = Depends(get_solr_manager),
 ):
     """
@@ -179,17 +259,19 @@ async def update_subtitles(
     subtitles_data = [s.dict() for s in request.subtitles]
 
     try:
-        # 3. Update MongoDB (Source of Truth)
-        mongo_client.update_subtitles(
+        # 3. Update MongoDB (Source of Truth), only if the segment is still at the expected version
+        version = await mongo_client.update_subtitles(
             media_id=media_id,
             segment_nr=segment_nr,
             subtitle_type=subtitle_type_str,
-            subtitles=subtitles_data
+            subtitles=subtitles_data,
+            expected_version=request.expected_version,
         )
         logger.info(f"media_id={media_id} - MongoDB segment {segment_nr} updated successfully.")
 
         # 4. Update Solr (Search Index)
-        solr_client.update_segment(
+        await run_in_threadpool(
+            solr_client.update_segment,
             media_id=media_id,
             segment_nr=segment_nr,
             subtitles=subtitles_data,
@@ -197,7 +279,11 @@ async def update_subtitles(
         )
         logger.info(f"media_id={media_id} - Solr index for segment {segment_nr} synced successfully.")
 
-        return {"status": "success", "media_id": media_id}
+        return {"status": "success", "media_id": media_id, "versions": {segment_nr: version}}
+
+    except SegmentVersionConflictError as ce:
+        logger.warning(f"media_id={media_id} - Concurrent edit detected for Segment {segment_nr}: {ce}")
+        raise HTTPException(status_code=409, detail="Segment was changed concurrently. Reload and retry.")
 
     except ValueError as ve:
         # Handle Validation Errors (Client-side issue)
@@ -210,6 +296,79 @@ async def update_subtitles(
         raise HTTPException(status_code=500, detail="Error updating subtitles")
 
 
+@router.post("/update-subtitles-batch", response_model=UpdateSubtitlesResponse)
+async def update_subtitles_batch(
+    request: UpdateSubtitlesBatchRequest,
+    mongo_client: AsyncMongoManager = Depends(get_async_mongo_manager),
+    solr_client: SolrManager = Depends(get_solr_manager),
+):
+    """
+    Update the subtitles of many segments in Mongo and Solr with one request each
+    """
+    media_id = request.media_id
+    subtitle_type_str = request.subtitle_type.value
+    logger.info(f"media_id={media_id} - UPDATE subtitles batch request. "
+                f"Type={subtitle_type_str}, Segments={len(request.segments)}")
+
+    if not request.segments:
+        return {"status": "no_change", "media_id": media_id}
+
+    segment_nrs = [s.segment_nr for s in request.segments]
+    if len(set(segment_nrs)) != len(segment_nrs):
+        raise HTTPException(status_code=400, detail="Each segment_nr may only occur once per batch")
+
+    segments = [(s.segment_nr, [sub.dict() for sub in s.subtitles]) for s in request.segments]
+    try:
+        versions = await mongo_client.update_subtitles_batch(
+            media_id=media_id,
+            subtitle_type=subtitle_type_str,
+            segments=[
+                (segment_nr, subtitles, s.expected_version)
+                for (segment_nr, subtitles), s in zip(segments, request.segments)
+            ],
+        )
+        logger.info(f"media_id={media_id} - MongoDB segments updated successfully.")
+
+        updated = await run_in_threadpool(
+            solr_client.update_segments, media_id=media_id, subtitle_type=subtitle_type_str, segments=segments,
+        )
+        logger.info(f"media_id={media_id} - Solr index synced successfully. Updated {updated} documents.")
+
+        return {"status": "success", "media_id": media_id, "versions": versions}
+
+    except SegmentVersionConflictError as ce:
+        logger.warning(f"media_id={media_id} - Concurrent edit detected in batch: {ce}")
+        if ce.partial:
+            await _resync_segments(mongo_client, solr_client, media_id, subtitle_type_str, [nr for nr, _ in segments])
+        raise HTTPException(status_code=409, detail="Segments were changed concurrently. Reload and retry.")
+
+    except ValueError as ve:
+        logger.warning(f"media_id={media_id} - Validation failed for subtitles batch: {ve}")
+        raise HTTPException(status_code=404, detail=str(ve))
+
+    except Exception:
+        logger.exception(f"media_id={media_id} - CRITICAL: Failed to update subtitles batch.")
+        raise HTTPException(status_code=500, detail="Error updating subtitles")
+
+
+async def _resync_segments(
+    mongo_client: AsyncMongoManager, solr_client: SolrManager, media_id: str, subtitle_type: str, segment_nrs: List[int]
+):
+    """Re-indexes segments from their current state in Mongo, after a partially applied batch."""
+    field = mongo_client.subtitle_field(subtitle_type)
+    wanted = set(segment_nrs)
+    current = await mongo_client.get_segments_by_range(media_id, min(wanted), max(wanted), [subtitle_type])
+    try:
+        await run_in_threadpool(
+            solr_client.update_segments,
+            media_id=media_id,
+            subtitle_type=subtitle_type,
+            segments=[(seg["segment_nr"], seg.get(field, [])) for seg in current if seg["segment_nr"] in wanted],
+        )
+    except Exception:
+        logger.exception(f"media_id={media_id} - Failed to re-sync Solr after a partial subtitles batch.")
+
+
 @router.post("/update-debate", response_model=UpdateMetadataResponse)
 def update_debate(
     request: UpdateDebateRequest,
@@ -1,8 +1,16 @@
 import logging
-from fastapi import APIRouter, Depends,Query, HTTPException
-from services.solr import get_solr_manager, SolrManager
-from models.search import SearchQuery, SearchResponse, FacetField, FacetValue
-from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends,Query, HTTPException
+from config.settings import get_settings
+from services.solr import (
+    get_solr_manager, SolrManager, DEFAULT_FACET_FIELDS, NESTED_FACET_SEPARATOR, SPEAKER_FIELDS, DEBATE_FIELDS,
+    parse_facet_fields, parse_json_facets, speaker_filter_query, speaker_media_ids, apply_speaker_maps,
+)
+from services.mongo_async import get_async_mongo_manager, AsyncMongoManager
+from services.solr_async import get_async_solr_manager, AsyncSolrManager
+from services.search_cache import get_search_cache, SearchCache
+from models.search import SearchQuery, SearchResponse, CompactSearchHit, DateGap
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -11,42 +19,134 @@ router = APIRouter()
 
 @router.get("/search-solr", response_model=SearchResponse)
 async def search_solr(
+    background_tasks: BackgroundTasks,
     q: Optional[str] = Query(None, alias="queryTerm", description="The main search string"),
     raw_filters: List[str] = Query([], alias="facetFilters", description="List of filters in 'field:value' format"),
-    facet_fields: List[str] = Query(
-        ["debate_date", "debate_timeslot", "statement_type", "debate_session", "speaker_name", "speaker_role_tag", "speaker_country"],
-        alias="facetFields"
-    ),
+    facet_fields: List[str] = Query(DEFAULT_FACET_FIELDS, alias="facetFields"),
     sort_by: Optional[str] = Query(None, alias="sortBy"),
     rows: int = Query(10, ge=1, le=100),
     start: int = Query(0, ge=0),
-    solr: SolrManager = Depends(get_solr_manager)
+    fields: List[str] = Query([], alias="fl", description="Additional stored fields to return"),
+    highlight_fields: List[str] = Query([], alias="hlFields", description="Fields to highlight, default 'statement'"),
+    highlight_snippets: Optional[int] = Query(None, alias="hlSnippets", ge=1, le=20),
+    highlight_fragsize: Optional[int] = Query(None, alias="hlFragsize", ge=0),
+    compact: bool = Query(False, description="Return only ids, timings, speaker fields and snippets"),
+    date_gap: Optional[DateGap] = Query(None, alias="dateGap", description="Histogram of debate_date by day, month or year"),
+    time_bucket: Optional[float] = Query(None, alias="timeBucket", gt=0, description="Histograms of start/end in seconds"),
+    nested_facets: List[str] = Query(
+        [], alias="nestedFacets", description="Nested term facets as 'parent>child', e.g. 'debate_session>speaker_name'"
+    ),
+    subtitle_hits: bool = Query(
+        False, alias="subtitleHits", description="Timestamps of the matching subtitles per returned segment"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Deep paging: '*' for the first page, then the returned nextCursor. Replaces 'start'."
+    ),
+    solr: SolrManager = Depends(get_solr_manager),
+    async_solr: AsyncSolrManager = Depends(get_async_solr_manager),
+    search_cache: SearchCache = Depends(get_search_cache),
+    mongo: AsyncMongoManager = Depends(get_async_mongo_manager)
 ):
+    settings = get_settings()
     parsed_filters = []
     for f in raw_filters:
         if ":" in f:
             field, value = f.split(":", 1)
             parsed_filters.append({"facetField": field, "facetValue": value})
 
+    if cursor and start:
+        raise HTTPException(status_code=400, detail="'start' cannot be combined with 'cursor'")
+
+    for nested in nested_facets:
+        nested_fields = nested.split(NESTED_FACET_SEPARATOR)
+        if len(nested_fields) < 2 or not set(nested_fields) <= set(DEFAULT_FACET_FIELDS):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid nested facet '{nested}': use 'parent>child' with fields of {DEFAULT_FACET_FIELDS}"
+            )
+        if settings.solr_query_time_speakers and set(nested_fields) & set(SPEAKER_FIELDS):
+            raise HTTPException(status_code=400, detail="Speaker fields cannot be nested with query-time speakers")
+        if settings.solr_debate_parents and set(nested_fields) & set(DEBATE_FIELDS):
+            raise HTTPException(status_code=400, detail="Debate fields cannot be nested with debate parent documents")
+
+    if settings.solr_query_time_speakers and sort_by and any(field in sort_by for field in SPEAKER_FIELDS):
+        # Not indexed: resolved from Mongo after the search
+        raise HTTPException(status_code=400, detail="Sorting by speaker fields is not supported with query-time speakers")
+    if settings.solr_debate_parents and sort_by and any(field in sort_by for field in DEBATE_FIELDS):
+        # Stored on the debate parents only
+        raise HTTPException(status_code=400, detail="Sorting by debate fields is not supported with debate parent documents")
+
+    # Query-time speakers: filters on speaker attributes become (media_id, speaker_id) filters
+    filter_queries = []
+    if settings.solr_query_time_speakers:
+        for f in parsed_filters:
+            if f["facetField"] in SPEAKER_FIELDS:
+                attribute, _ = SPEAKER_FIELDS[f["facetField"]]
+                speaker_ids_by_media = await mongo.find_speaker_ids(attribute, f["facetValue"])
+                filter_queries.append(speaker_filter_query(speaker_ids_by_media))
+
     logger.info(f"Search Query: q='{q}' | filters={len(parsed_filters)} | sort='{sort_by}' | range={start}-{start+rows}")
 
+    # Unfiltered search (landing page): global facet counts come from the snapshot
+    snapshot = None
+    if not (q or "").strip() and not parsed_filters and settings.facet_snapshot_enabled:
+        snapshot = await search_cache.get_facet_snapshot()
+        if snapshot is None or (snapshot["stale"] and not snapshot["pending"]):
+            background_tasks.add_task(refresh_facet_snapshot, solr)
+        if snapshot is not None and not set(facet_fields) <= set(snapshot["fields"]):
+            snapshot = None
+
     internal_query_model = SearchQuery(
         queryTerm=q,
         facetFilters=parsed_filters,
-        facetFields=facet_fields,
+        facetFields=[] if snapshot else facet_fields,
         sortBy=sort_by,
         rows=rows,
         start=start,
+        fields=fields or None,
+        highlightFields=highlight_fields or None,
+        highlightSnippets=highlight_snippets,
+        highlightFragsize=highlight_fragsize,
+        compact=compact,
+        cursor=cursor,
+        dateGap=date_gap,
+        timeBucket=time_bucket,
+        nestedFacets=nested_facets,
+        subtitleHits=subtitle_hits and bool((q or "").strip()) and settings.solr_subtitle_documents,
+        filterQueries=filter_queries,
     )
 
-    try:
-        results = solr.search(internal_query_model)
-    except Exception as e:
-        logger.error(f"Solr Query Failed: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Search service unavailable")
+    async def run_search():
+        try:
+            results = await async_solr.search(internal_query_model)
+            if settings.solr_query_time_speakers:
+                speaker_maps = await mongo.get_speaker_maps(speaker_media_ids(results.raw_response))
+                apply_speaker_maps(results.raw_response, speaker_maps, internal_query_model.facetFields)
+            hits_by_segment = {}
+            if internal_query_model.subtitleHits:
+                segment_ids = [doc["id"] for doc in results.docs]
+                hits_by_segment = await async_solr.search_subtitle_hits(internal_query_model, segment_ids)
+        except Exception as e:
+            logger.error(f"Solr Query Failed: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail="Search service unavailable")
+        return build_search_response(
+            results.raw_response, compact, cursor, hits_by_segment
+        ).model_dump(mode="json")
+
+    response, cached = await search_cache.get_or_compute(internal_query_model, run_search)
+    if cached:
+        logger.info(f"Search served from cache. Found {response['total']} hits.")
+
+    if snapshot:
+        # With a date histogram, the range facet replaces the debate_date term facet
+        term_fields = [field for field in facet_fields if not (date_gap and field == "debate_date")]
+        response = apply_facet_snapshot(response, snapshot, term_fields)
+    return response
 
-    raw = results.raw_response
 
+def build_search_response(
+    raw: dict, compact: bool = False, cursor: Optional[str] = None, subtitle_hits: Optional[dict] = None
+) -> SearchResponse:
     docs = raw.get("response", {}).get("docs", [])
     num_found = raw.get("response", {}).get("numFound", 0)
     highlighting = raw.get("highlighting", {})
@@ -56,23 +156,61 @@ async def search_solr(
     else:
         logger.info(f"Search completed. Found {num_found} hits. Returning {len(docs)} docs.")
 
-    clean_facets = []
-    raw_facet_fields = raw.get("facet_counts", {}).get("facet_fields", {})
+    clean_facets = parse_facet_fields(raw.get("facet_counts", {}).get("facet_fields", {}))
+    json_facets = parse_json_facets(raw.get("facets", {}))
 
-    for field, flat_values in raw_facet_fields.items():
-        facet_values_list = []
-        for i in range(0, len(flat_values), 2):
-            label = flat_values[i]
-            count = flat_values[i+1]
-            if count > 0:
-                facet_values_list.append(FacetValue(label=str(label), count=count))
+    # Solr returns the same cursor mark again once the last page is reached
+    next_cursor = raw.get("nextCursorMark")
+    if next_cursor == cursor:
+        next_cursor = None
 
-        if facet_values_list:
-            clean_facets.append(FacetField(field_name=field, values=facet_values_list))
+    if compact:
+        hits = [
+            CompactSearchHit(
+                **doc,
+                snippets=[
+                    snippet
+                    for snippets in highlighting.get(doc["id"], {}).values()
+                    for snippet in snippets
+                ],
+            )
+            for doc in docs
+        ]
+        return SearchResponse(
+            docs=[], total=num_found, facets=clean_facets, json_facets=json_facets, hits=hits,
+            subtitle_hits=subtitle_hits or {}, nextCursor=next_cursor
+        )
 
     return SearchResponse(
         docs=docs,
         total=num_found,
         facets=clean_facets,
-        highlighting=highlighting
+        json_facets=json_facets,
+        highlighting=highlighting,
+        subtitle_hits=subtitle_hits or {},
+        nextCursor=next_cursor
     )
+
+
+def apply_facet_snapshot(response: Dict[str, Any], snapshot: Dict[str, Any], facet_fields: List[str]) -> Dict[str, Any]:
+    """Adds the requested facets of the snapshot, in request order, with its staleness."""
+    facets_by_field = {facet["field_name"]: facet for facet in snapshot["facets"]}
+    computed_at = datetime.fromisoformat(snapshot["computed_at"])
+
+    return {
+        **response,
+        "facets": [facets_by_field[field] for field in facet_fields if field in facets_by_field],
+        "facets_snapshot": {
+            "computed_at": computed_at,
+            "age_seconds": (datetime.utcnow() - computed_at).total_seconds(),
+            "stale": snapshot["stale"] or snapshot["pending"],
+        },
+    }
+
+
+def refresh_facet_snapshot(solr: SolrManager):
+    """Background refresh after index writes: failures only leave the old snapshot in place."""
+    try:
+        solr.refresh_facet_snapshot()
+    except Exception as e:
+        logger.error(f"Facet snapshot refresh failed: {e}", exc_info=True)
@@ -0,0 +1,161 @@
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+import bson
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LRUTTLCache:
+    """
+    Thread-safe in-process LRU cache with a time to live.
+    Bounded by number of entries and by the estimated size of the values.
+    Keys are tuples whose second element is the media_id, so that all
+    entries of a media can be invalidated at once.
+    """
+
+    def __init__(self, name: str, max_entries: int, max_bytes: int, ttl: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._keys_by_media: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, _, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Stores a value; 'ttl' overrides the time to live of the cache for this entry."""
+        if not self.enabled:
+            return
+
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug(f"Cache '{self.name}': value for {key} too large ({size} bytes), not cached.")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), size, value)
+            self._keys_by_media.setdefault(key[1], set()).add(key)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, media_id: str):
+        """Drops all entries of a media."""
+        with self._lock:
+            keys = self._keys_by_media.pop(media_id, set())
+            for key in keys:
+                self._remove(key)
+            if keys:
+                self.invalidations += 1
+                logger.debug(f"Cache '{self.name}': invalidated {len(keys)} entries for media_id={media_id}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_media.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: Hashable):
+        # Caller holds the lock
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        keys = self._keys_by_media.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_media[key[1]]
+
+
+def _estimate_size(value: Any) -> int:
+    """Estimates the memory footprint of a metadata value by its BSON size."""
+    try:
+        # bson only encodes documents: lists and scalars are wrapped in one
+        return len(bson.encode(value if isinstance(value, dict) else {"v": value}))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+@lru_cache()
+def get_metadata_cache() -> LRUTTLCache:
+    """
+    Process wide cache for debate documents and full metadata, keyed by media_id.
+    """
+    settings = get_settings()
+    return LRUTTLCache(
+        name="metadata",
+        max_entries=settings.metadata_cache_max_entries,
+        max_bytes=settings.metadata_cache_max_bytes,
+        ttl=settings.metadata_cache_ttl,
+    )
+
+
+@lru_cache()
+def get_presigned_url_cache() -> LRUTTLCache:
+    """
+    Process wide cache for presigned S3 URLs and the signed URL sets of media, keyed by media_id.
+    Entries carry their own time to live, derived from the URL expiry.
+    """
+    settings = get_settings()
+    return LRUTTLCache(
+        name="presigned_urls",
+        max_entries=settings.s3_url_cache_max_entries,
+        max_bytes=settings.s3_url_cache_max_bytes,
+        ttl=settings.s3_url_set_ttl,
+    )
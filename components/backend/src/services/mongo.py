@@ -1,44 +1,247 @@
+import base64
+import json
 import logging
-from typing import Dict, Any, List, Set
-from pymongo import MongoClient, ReturnDocument
+from typing import Dict, Any, List, Set, Iterable, Optional, Tuple
+from pymongo import MongoClient, UpdateOne, IndexModel, ReturnDocument, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
 from datetime import datetime
 from config.settings import get_settings
 from functools import lru_cache
+from services.cache import get_metadata_cache
 
 logger = logging.getLogger(__name__)
 
 
+# Indexes required by the queries of the MongoManager.
+# Keys are the collection attributes of the MongoManager.
+MONGO_INDEXES = {
+    "media_collection": [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id_desc"),
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="status_created_at_id_desc",
+        ),
+    ],
+    "speakers_collection": [
+        IndexModel([("media_id", ASCENDING)], name="media_id_unique", unique=True),
+    ],
+    "subtitles_collection": [
+        IndexModel([("media_id", ASCENDING)], name="media_id"),
+    ],
+    "status_events_collection": [
+        IndexModel([("media_id", ASCENDING), ("timestamp", ASCENDING)], name="media_id_timestamp"),
+    ],
+    "artifacts_collection": [
+        IndexModel([("media_id", ASCENDING), ("_id", ASCENDING)], name="media_id_id"),
+    ],
+    "segments_collection": [
+        IndexModel(
+            [("media_id", ASCENDING), ("segment_nr", ASCENDING)],
+            name="media_id_segment_nr_unique",
+            unique=True,
+        ),
+        IndexModel(
+            [("media_id", ASCENDING), ("start", ASCENDING), ("end", ASCENDING)],
+            name="media_id_start_end",
+        ),
+    ],
+}
+
+# Sort orders of the queries, shared by the sync and async managers
+MEDIA_LIST_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+STATUS_EVENTS_SORT = [("timestamp", ASCENDING)]
+ARTIFACTS_SORT = [("_id", ASCENDING)]
+SEGMENTS_SORT = [("segment_nr", ASCENDING)]
+SEGMENT_WINDOW_SORT = [("start", ASCENDING)]
+
+# Hot queries that must be served by an index: (collection attribute, filter, sort)
+# The filter values are placeholders: only the query shape matters for the plan.
+MONGO_HOT_QUERIES = [
+    ("media_collection", {}, MEDIA_LIST_SORT),
+    ("media_collection", {"status": "x"}, MEDIA_LIST_SORT),
+    ("speakers_collection", {"media_id": "x"}, None),
+    ("status_events_collection", {"media_id": "x"}, STATUS_EVENTS_SORT),
+    ("artifacts_collection", {"media_id": "x"}, ARTIFACTS_SORT),
+    ("segments_collection", {"media_id": "x"}, SEGMENTS_SORT),
+    ("segments_collection", {"media_id": "x", "segment_nr": 1}, None),
+    ("segments_collection", {"media_id": "x", "start": {"$lt": 60.0}, "end": {"$gt": 0.0}}, SEGMENT_WINDOW_SORT),
+]
+
+
+# Storage formats of the segment subtitles:
+# documents: [{"start": 0.0, "end": 2.5, "text": "..."}, ...]
+# columnar:  {"starts": [0.0, ...], "ends": [2.5, ...], "texts": ["...", ...]}
+SUBTITLE_FORMAT_DOCUMENTS = "documents"
+SUBTITLE_FORMAT_COLUMNAR = "columnar"
+SUBTITLE_FIELDS = ("subtitles_original", "subtitles_translation")
+# Errors of an aggregation result above the 16 MB BSON limit (BSONObjectTooLarge, $lookup result too large)
+DOCUMENT_TOO_LARGE_CODES = {10334, 4568, 17419}
+# Edit version of each subtitle field, incremented on every write (optimistic concurrency)
+VERSION_FIELDS = {"subtitles_original": "version_original", "subtitles_translation": "version_translation"}
+# Language of each subtitle field, stored per segment and per media (latest bulk save)
+LANGUAGE_FIELDS = {"subtitles_original": "language_original", "subtitles_translation": "language_translation"}
+
+
+# Fields of an artifact in the manifest: one document per S3 object, _id is the key
+ARTIFACT_PROJECTION = {"_id": 0, "key": 1, "size": 1, "etag": 1, "content_type": 1}
+
+
+# Fields returned for the dashboard listing
+MEDIA_LIST_PROJECTION = {
+    "original_filename": 1,
+    "status": 1,
+    "error_message": 1,
+    "created_at": 1,
+    "title": 1,
+}
+
+
 class DocumentNotFoundError(Exception):
     pass
 
-class MongoManager:
+
+class IndexCheckError(Exception):
+    pass
+
+
+class SegmentVersionConflictError(Exception):
+    """
+    A segment was changed since the editor loaded it.
+    'partial' is set if other segments of the same batch were written.
+    """
+    def __init__(self, message: str, partial: bool = False):
+        super().__init__(message)
+        self.partial = partial
+
+
+class BaseMongoManager:
+    """
+    Shared setup for the sync and async managers: settings, collections and
+    helpers that don't talk to the database.
+    """
+    client_class = None
+
     def __init__(self):
         settings = get_settings()
         self.mongo_url = settings.mongo_url
         self.db_name = settings.mongo_db_name
         self.type_original = settings.type_original
         self.type_translation = settings.type_translation
+        self.bulk_chunk_size = settings.mongo_bulk_chunk_size
+        self.processing_history_limit = settings.processing_history_limit
+        self.status_events_timeseries = settings.mongo_status_events_timeseries
+        self.subtitle_format = settings.mongo_subtitle_format
+        if self.subtitle_format not in (SUBTITLE_FORMAT_DOCUMENTS, SUBTITLE_FORMAT_COLUMNAR):
+            raise ValueError(f"Unknown subtitle format: {self.subtitle_format}")
+        self.cache = get_metadata_cache()
 
         try:
-            self.client = MongoClient(self.mongo_url)
+            self.client = self.client_class(self.mongo_url)
             self.db = self.client[self.db_name]
 
             self.media_collection = self.db[settings.mongo_media_collection]
             self.speakers_collection = self.db[settings.mongo_speaker_collection]
             self.subtitles_collection = self.db[settings.mongo_subtitle_collection]
             self.segments_collection = self.db[settings.mongo_segment_collection]
+            self.status_events_collection = self.db[settings.mongo_status_event_collection]
+            self.artifacts_collection = self.db[settings.mongo_artifact_collection]
 
-            logger.info(f"MongoManager initialized for DB: {self.db_name}")
+            logger.info(f"{type(self).__name__} initialized for DB: {self.db_name}")
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise e
 
-    def update_status_with_history(self, media_id: str, status: str, job_id: str = None, metadata: Dict = None):
+    def subtitle_field(self, subtitle_type: str) -> str:
+        """Segment field holding the subtitles of a subtitle type."""
+        if subtitle_type == self.type_original:
+            return "subtitles_original"
+        if subtitle_type == self.type_translation:
+            return "subtitles_translation"
+        raise ValueError(f"Unknown subtitle_type: {subtitle_type}")
+
+    def _version_field(self, subtitle_type: str) -> str:
+        return VERSION_FIELDS[self.subtitle_field(subtitle_type)]
+
+    def _language_field(self, subtitle_type: str) -> str:
+        return LANGUAGE_FIELDS[self.subtitle_field(subtitle_type)]
+
+    def _subtitle_update(
+        self, media_id: str, segment_nr: int, subtitle_type: str, subtitles: List[Dict],
+        expected_version: Optional[int], current_time: datetime,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
-        Updates the current status and appends it to the processing history in a single atomic operation.
+        Filter and update of a subtitle edit. With 'expected_version' the update only
+        matches while the segment is still at that version; every write increments it.
         """
-        logger.info(f"media_id={media_id} - Transitioning status to '{status}'")
+        version_field = self._version_field(subtitle_type)
+        query_filter = {"media_id": media_id, "segment_nr": segment_nr}
+        if expected_version is not None:
+            # Segments stored before versioning have no version field: version 0
+            query_filter[version_field] = expected_version or {"$in": [0, None]}
+
+        update = {
+            "$set": {
+                self.subtitle_field(subtitle_type): self._encode_subtitles(subtitles),
+                "updated_at": current_time,
+            },
+            "$inc": {version_field: 1},
+        }
+        return query_filter, update
+
+    def _subtitle_update_error(
+        self, media_id: str, segment_nrs: Iterable[int], existing: Iterable[int]
+    ) -> Exception:
+        """Error of a subtitle edit that matched no segment: missing (ValueError) or changed concurrently."""
+        missing = sorted(set(segment_nrs) - set(existing))
+        if missing:
+            return ValueError(f"Segments {missing} for media {media_id} not found.")
+        return SegmentVersionConflictError(f"Segments of media {media_id} were changed concurrently.")
+
+    def _segment_filter(self, media_id: str, segment_nr: int) -> Dict[str, Any]:
+        return {"media_id": media_id, "segment_nr": segment_nr}
+
+    def _segment_range_filter(self, media_id: str, from_segment: int, to_segment: int) -> Dict[str, Any]:
+        """Segments with from_segment <= segment_nr <= to_segment."""
+        return {"media_id": media_id, "segment_nr": {"$gte": from_segment, "$lte": to_segment}}
+
+    def _segment_versions_query(
+        self, media_id: str, segment_nrs: List[int], subtitle_type: str
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Filter and projection reading the edit versions of some segments."""
+        return (
+            {"media_id": media_id, "segment_nr": {"$in": segment_nrs}},
+            {"_id": 0, "segment_nr": 1, self._version_field(subtitle_type): 1},
+        )
 
+    def _current_versions(
+        self, media_id: str, subtitle_type: str, segments: List[Tuple[int, list, Optional[int]]],
+        docs: Iterable[Dict[str, Any]],
+    ) -> Dict[int, int]:
+        """
+        {segment_nr: version} of the segments read by _segment_versions_query.
+        Raises if a segment is missing or no longer at its expected version.
+        """
+        version_field = self._version_field(subtitle_type)
+        current = {doc["segment_nr"]: doc.get(version_field) or 0 for doc in docs}
+        segment_nrs = [segment_nr for segment_nr, _, _ in segments]
+        if len(current) != len(set(segment_nrs)) or any(
+            expected is not None and expected != current[segment_nr] for segment_nr, _, expected in segments
+        ):
+            raise self._subtitle_update_error(media_id, segment_nrs, current)
+        return current
+
+    def _encode_subtitles(self, subtitles: List[Dict], subtitle_format: str = None) -> Any:
+        """Converts API shaped subtitles into the configured storage format."""
+        return encode_subtitles(subtitles, subtitle_format or self.subtitle_format)
+
+    def _status_update(
+        self, media_id: str, status: str, job_id: str = None, metadata: Dict = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Builds the status event and the media update for a state transition.
+        The media document only keeps the last 'processing_history_limit' steps,
+        the full history lives in the status events collection.
+        """
         current_time = datetime.utcnow()
 
         set_fields = {
@@ -50,19 +253,345 @@ class MongoManager:
         if metadata:
             set_fields.update(metadata)
 
-        return self.media_collection.find_one_and_update(
-            {"_id": media_id},
-            {
-                "$set": set_fields,
-                "$push": {
-                    "processing_history": {
-                        "step": status,
-                        "timestamp": current_time
-                    }
+        event = {
+            "media_id": media_id,
+            "step": status,
+            "timestamp": current_time,
+        }
+        if job_id:
+            event["job_id"] = job_id
+
+        update = {
+            "$set": set_fields,
+            "$push": {
+                "processing_history": {
+                    "$each": [{"step": status, "timestamp": current_time}],
+                    "$slice": -self.processing_history_limit,
                 }
-            },
-            return_document=ReturnDocument.AFTER
+            }
+        }
+        return event, update
+
+    def _full_metadata_cache_key(self, media_id: str, subtitle_types: Optional[List[str]]) -> Tuple:
+        return ("full_metadata", media_id, tuple(sorted(subtitle_types)) if subtitle_types is not None else None)
+
+    def _debate_cache_key(self, media_id: str) -> Tuple:
+        return ("debate", media_id)
+
+    def _speaker_map_cache_key(self, media_id: str) -> Tuple:
+        return ("speaker_map", media_id)
+
+    def _artifacts_cache_key(self, media_id: str) -> Tuple:
+        return ("artifacts", media_id)
+
+    def _debate_from_doc(self, media_id: str, debate: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Debate of a media document in the API shape (media_id instead of _id)."""
+        if not debate:
+            raise DocumentNotFoundError(f"Debate {media_id} not found")
+        debate["media_id"] = str(debate.pop("_id"))
+        return debate
+
+    def _initial_media_document(
+        self, media_id: str, s3_key: str, filename: str, media_type: str, status: str
+    ) -> Dict[str, Any]:
+        """First entry of the media in the db: assumes that upload to S3 already happened."""
+        current_time = datetime.utcnow()
+        return {
+            "_id": media_id,
+            "s3_key": s3_key,
+            "original_filename": filename,
+            "media_type": media_type,
+            "status": status,
+            "created_at": current_time,
+            "updated_at": current_time,
+            "error_message": None
+        }
+
+    def _speakers_update(self, speakers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {"$set": {"speakers": speakers, "updated_at": datetime.utcnow()}}
+
+    def _speaker_maps_query(self, media_ids: List[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return {"media_id": {"$in": media_ids}}, {"_id": 0, "media_id": 1, "speakers": 1}
+
+    def _media_delete_filters(self, media_id: str) -> List[Tuple[Any, Dict[str, Any]]]:
+        """(collection, filter) of every document of a media, the media document last."""
+        by_media = {"media_id": media_id}
+        return [
+            (self.artifacts_collection, by_media),
+            (self.speakers_collection, by_media),
+            (self.subtitles_collection, by_media),
+            (self.segments_collection, by_media),
+            (self.status_events_collection, by_media),
+            (self.media_collection, {"_id": media_id}),
+        ]
+
+    def _artifact_document(self, media_id: str, artifact: Dict[str, Any]) -> Dict[str, Any]:
+        """Manifest entry of an S3 object: key, size, etag and content type."""
+        return {
+            "_id": artifact["key"],
+            "media_id": media_id,
+            "key": artifact["key"],
+            "size": artifact.get("size"),
+            "etag": artifact.get("etag"),
+            "content_type": artifact.get("content_type"),
+            "updated_at": datetime.utcnow(),
+        }
+
+    def _speaker_maps_from_docs(
+        self, media_ids: Iterable[str], docs: Iterable[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Dict]]:
+        """{media_id: {speaker_id: speaker}} for the given media; media without speakers map to {}."""
+        speaker_maps = {media_id: {} for media_id in media_ids}
+        for doc in docs:
+            speaker_maps[doc["media_id"]] = {
+                speaker.get("speaker_id"): speaker for speaker in doc.get("speakers", [])
+            }
+        return speaker_maps
+
+    def _speaker_pairs_pipeline(self, attribute: str, value: str) -> List[Dict[str, Any]]:
+        """Aggregation of the (media_id, speaker_id) pairs whose speaker attribute equals value."""
+        match = {f"speakers.{attribute}": value}
+        return [
+            {"$match": match},
+            {"$unwind": "$speakers"},
+            {"$match": match},
+            {"$group": {"_id": "$media_id", "speaker_ids": {"$addToSet": "$speakers.speaker_id"}}},
+        ]
+
+    def _segment_projection(self, subtitle_types: Optional[List[str]] = None) -> Optional[Dict[str, int]]:
+        """Projection that excludes the subtitle arrays not listed in 'subtitle_types'."""
+        if subtitle_types is None:
+            return None
+        wanted = {self.subtitle_field(t) for t in subtitle_types}
+        excluded = {"subtitles_original", "subtitles_translation"} - wanted
+        return {field: 0 for field in excluded} or None
+
+    def _segment_window_filter(self, media_id: str, from_time: float, to_time: float) -> Dict[str, Any]:
+        """Segments overlapping the interval [from_time, to_time]."""
+        return {
+            "media_id": media_id,
+            "start": {"$lte": to_time},
+            "end": {"$gte": from_time},
+        }
+
+    def _full_metadata_pipeline(
+        self, media_id: str, subtitle_types: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregation that joins the debate with its speakers and sorted segments.
+        'subtitle_types' restricts the returned subtitle arrays (default: all).
+        """
+        segment_pipeline = [{"$sort": {"segment_nr": 1}}]
+        projection = self._segment_projection(subtitle_types)
+        if projection:
+            segment_pipeline.append({"$project": projection})
+
+        return [
+            {"$match": {"_id": media_id}},
+            {"$lookup": {
+                "from": self.speakers_collection.name,
+                "localField": "_id",
+                "foreignField": "media_id",
+                "pipeline": [{"$project": {"_id": 0, "speakers": 1}}],
+                "as": "speakers_docs",
+            }},
+            {"$lookup": {
+                "from": self.segments_collection.name,
+                "localField": "_id",
+                "foreignField": "media_id",
+                "pipeline": segment_pipeline,
+                "as": "segments",
+            }},
+        ]
+
+    def _full_metadata_from_aggregate(self, media_id: str, docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Splits the aggregation result into the debate/speakers/segments response."""
+        debate = self._debate_from_doc(media_id, docs[0] if docs else None)
+
+        speakers_docs = debate.pop("speakers_docs", [])
+        speakers_list = speakers_docs[0].get("speakers", []) if speakers_docs else []
+        segments_list = [decode_segment(seg) for seg in debate.pop("segments", [])]
+
+        return {
+            "debate": debate,
+            "speakers": speakers_list,
+            "segments": segments_list
+        }
+
+    def _full_metadata_from_parts(
+        self, media_id: str, debate: Optional[Dict[str, Any]], speakers_doc: Optional[Dict[str, Any]],
+        segments: Iterable[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Debate/speakers/segments response of the three-query variant."""
+        return {
+            "debate": self._debate_from_doc(media_id, debate),
+            "speakers": speakers_doc.get("speakers", []) if speakers_doc else [],
+            "segments": [decode_segment(seg) for seg in segments],
+        }
+
+    def _media_status_filter(self, status: Optional[str]) -> Dict[str, Any]:
+        """Media of the dashboard listing: all or those with one status."""
+        return {"status": status} if status else {}
+
+    def _media_list_query(
+        self, cursor: Optional[str], status: Optional[str], history_limit: int
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Builds filter and projection for a page of the dashboard listing."""
+        query_filter = self._media_status_filter(status)
+
+        if cursor:
+            created_at, last_id = _decode_cursor(cursor)
+            query_filter["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": last_id}},
+            ]
+
+        projection = MEDIA_LIST_PROJECTION.copy()
+        if history_limit > 0:
+            projection["processing_history"] = {"$slice": -history_limit}
+
+        return query_filter, projection
+
+    def _media_list_page(
+        self, docs: List[Dict[str, Any]], limit: int
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Cuts the extra look-ahead document and derives the next cursor from it."""
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = _encode_cursor(docs[-1].get("created_at"), docs[-1]["_id"])
+        return docs, next_cursor
+
+
+class MongoManager(BaseMongoManager):
+    client_class = MongoClient
+
+    def ensure_indexes(self) -> Dict[str, List[str]]:
+        """
+        Creates the declared indexes on all collections.
+        Idempotent: existing indexes with the same definition are left untouched.
+        """
+        self._ensure_status_events_collection()
+
+        created = {}
+        for collection_attr, indexes in MONGO_INDEXES.items():
+            collection = getattr(self, collection_attr)
+            created[collection.name] = collection.create_indexes(indexes)
+            logger.info(f"Ensured indexes on '{collection.name}': {created[collection.name]}")
+        return created
+
+    def _ensure_status_events_collection(self):
+        """Creates the status events as time-series collection if configured and missing."""
+        name = self.status_events_collection.name
+        if not self.status_events_timeseries or name in self.db.list_collection_names():
+            return
+
+        self.db.create_collection(
+            name,
+            timeseries={"timeField": "timestamp", "metaField": "media_id", "granularity": "seconds"},
+        )
+        logger.info(f"Created time-series collection '{name}'")
+
+    def check_indexes(self) -> Dict[str, List[str]]:
+        """
+        Runs explain() on each hot query and returns the stages of the winning plans.
+        Raises IndexCheckError if a query is not answered by an index scan.
+        """
+        plans = {}
+        failures = []
+        for collection_attr, query_filter, sort in MONGO_HOT_QUERIES:
+            collection = getattr(self, collection_attr)
+            cursor = collection.find(query_filter)
+            if sort:
+                cursor = cursor.sort(sort)
+
+            stages = _collect_plan_stages(_winning_plan(cursor.explain()))
+
+            label = f"{collection.name} filter={query_filter} sort={sort}"
+            plans[label] = stages
+            if "IXSCAN" not in stages or "COLLSCAN" in stages:
+                failures.append(f"{label}: {stages}")
+
+        if failures:
+            raise IndexCheckError(f"Queries without index scan: {failures}")
+
+        return plans
+
+    def update_status_with_history(self, media_id: str, status: str, job_id: str = None, metadata: Dict = None):
+        """
+        Updates the current status, appends the step to the capped processing history
+        and records it in the append-only status events collection.
+        """
+        logger.info(f"media_id={media_id} - Transitioning status to '{status}'")
+
+        event, update = self._status_update(media_id, status, job_id, metadata)
+
+        self.status_events_collection.insert_one(event)
+        self.media_collection.update_one({"_id": media_id}, update)
+        self.cache.invalidate(media_id)
+
+    def get_status_events(self, media_id: str) -> List[Dict[str, Any]]:
+        """Returns the full processing history of a media, oldest first."""
+        cursor = self.status_events_collection.find({"media_id": media_id}, {"_id": 0}).sort(STATUS_EVENTS_SORT)
+        return list(cursor)
+
+    def migrate_processing_history(self) -> Dict[str, int]:
+        """
+        Copies the embedded processing histories into the status events collection
+        (for media without events yet) and caps the embedded histories.
+        """
+        counts = {"media": 0, "events": 0}
+        cursor = self.media_collection.find(
+            {"processing_history.0": {"$exists": True}}, {"processing_history": 1}
         )
+        for doc in cursor:
+            media_id = doc["_id"]
+            if not self.status_events_collection.find_one({"media_id": media_id}, {"_id": 1}):
+                events = [
+                    {"media_id": media_id, "step": step.get("step"), "timestamp": step.get("timestamp")}
+                    for step in doc.get("processing_history", [])
+                ]
+                if events:
+                    self.status_events_collection.insert_many(events)
+                    counts["events"] += len(events)
+
+            self.media_collection.update_one(
+                {"_id": media_id},
+                {"$push": {"processing_history": {"$each": [], "$slice": -self.processing_history_limit}}}
+            )
+            counts["media"] += 1
+
+        return counts
+
+    def migrate_subtitle_format(self, subtitle_format: str, chunk_size: int = None) -> int:
+        """
+        Rewrites the subtitles of all segments into the given storage format.
+        Returns the number of modified segments.
+        """
+        if subtitle_format not in (SUBTITLE_FORMAT_DOCUMENTS, SUBTITLE_FORMAT_COLUMNAR):
+            raise ValueError(f"Unknown subtitle format: {subtitle_format}")
+        chunk_size = chunk_size or self.bulk_chunk_size
+
+        modified = 0
+        operations = []
+        projection = {field: 1 for field in SUBTITLE_FIELDS}
+        for seg in self.segments_collection.find({}, projection):
+            set_fields = {
+                field: encode_subtitles(decode_subtitles(seg[field]), subtitle_format)
+                for field in SUBTITLE_FIELDS if field in seg
+            }
+            if not set_fields:
+                continue
+            operations.append(UpdateOne({"_id": seg["_id"]}, {"$set": set_fields}))
+            if len(operations) >= chunk_size:
+                modified += self.segments_collection.bulk_write(operations, ordered=False).modified_count
+                operations = []
+
+        if operations:
+            modified += self.segments_collection.bulk_write(operations, ordered=False).modified_count
+
+        self.cache.clear()
+        return modified
 
     def save_speakers(self, media_id: str, speaker_ids: Set[str]):
         speakers = [{"speaker_id": sid, "name": "", "role_tag": "", "country": ""} for sid in speaker_ids]
@@ -92,15 +621,10 @@ class MongoManager:
         Saves subtitles to a specific segment document.
         Optionally updates the segment's root metadata (Start/End/Speaker).
         """
-        if subtitle_type == self.type_original:
-            target_field = "subtitles_original"
-        elif subtitle_type == self.type_translation:
-            target_field = "subtitles_translation"
-        else:
-            raise ValueError(f"Unknown subtitle_type: {subtitle_type}")
+        target_field = self.subtitle_field(subtitle_type)
 
         update_fields = {
-            target_field: subtitles,
+            target_field: self._encode_subtitles(subtitles),
             "updated_at": datetime.utcnow()
         }
 
@@ -117,37 +641,116 @@ class MongoManager:
                 "segment_nr": segment_nr
             },
             {
-                "$set": update_fields
+                "$set": update_fields,
+                "$inc": {self._version_field(subtitle_type): 1},
             },
             upsert=True
         )
 
-    def get_full_metadata(self, media_id: str) -> Dict[str, Any]:
-        debate = self.media_collection.find_one({"_id": media_id})
-        if not debate:
-            raise DocumentNotFoundError(f"Debate {media_id} not found")
-
-        debate["media_id"] = str(debate.pop("_id"))
-
-        speakers_doc = self.speakers_collection.find_one({"media_id": media_id})
-        speakers_list = speakers_doc.get("speakers", []) if speakers_doc else []
+    def save_segments_bulk(
+        self,
+        media_id: str,
+        subtitle_type: str,
+        segments: Iterable[Dict],
+        chunk_size: int = None,
+        ordered: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Saves many segments of one subtitle type with bulk upserts.
+        Expects the segments as produced by the parser:
+        [{'segment_nr': 1, 'language': ..., 'start': ..., 'end': ..., 'speaker_id': ..., 'subtitles': [...]}, ...]
+        The language is also stored on the media, as fallback for segments saved without one.
+        Writes are sent in chunks of 'chunk_size' operations (defaults to the settings).
+        Returns the accumulated matched/modified/upserted counts.
+        """
+        target_field = self.subtitle_field(subtitle_type)
+        language_field = self._language_field(subtitle_type)
+        media_language = None
+        chunk_size = chunk_size or self.bulk_chunk_size
 
-        cursor = self.segments_collection.find({"media_id": media_id}).sort("segment_nr", 1)
-        segments_list = list(cursor)
+        counts = {"matched": 0, "modified": 0, "upserted": 0}
+        operations = []
 
-        return {
-            "debate": debate,
-            "speakers": speakers_list,
-            "segments": segments_list
-        }
+        def flush():
+            result = self.segments_collection.bulk_write(operations, ordered=ordered)
+            counts["matched"] += result.matched_count
+            counts["modified"] += result.modified_count
+            counts["upserted"] += result.upserted_count
+            operations.clear()
 
-    def get_debate_metadata(self, media_id: str) -> Dict[str, Any]:
+        current_time = datetime.utcnow()
+        for seg in segments:
+            update_fields = {
+                target_field: self._encode_subtitles(seg["subtitles"]),
+                "updated_at": current_time
+            }
+            for field in ("start", "end", "speaker_id"):
+                if seg.get(field) is not None:
+                    update_fields[field] = seg[field]
+            if seg.get("language"):
+                update_fields[language_field] = seg["language"]
+                media_language = media_language or seg["language"]
+
+            operations.append(UpdateOne(
+                {
+                    "media_id": media_id,
+                    "segment_nr": seg["segment_nr"]
+                },
+                {
+                    "$set": update_fields,
+                    # Open editors of the previous transcript get a conflict on save
+                    "$inc": {self._version_field(subtitle_type): 1},
+                },
+                upsert=True
+            ))
+            if len(operations) >= chunk_size:
+                flush()
+
+        if operations:
+            flush()
+        if media_language:
+            self.media_collection.update_one({"_id": media_id}, {"$set": {language_field: media_language}})
+
+        logger.info(f"media_id={media_id} - Bulk saved segments for {subtitle_type}: {counts}")
+        return counts
+
+    def get_full_metadata(self, media_id: str, subtitle_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Returns debate, speakers and sorted segments in one aggregation round trip.
+        'subtitle_types' restricts the returned subtitle arrays (default: all).
+        """
+        pipeline = self._full_metadata_pipeline(media_id, subtitle_types)
+        try:
+            docs = list(self.media_collection.aggregate(pipeline))
+        except OperationFailure as e:
+            if not is_document_too_large(e):
+                raise
+            logger.warning(f"media_id={media_id} - Metadata exceeds the BSON limit, loading it with three queries.")
+            return self.get_full_metadata_sequential(media_id, subtitle_types)
+        return self._full_metadata_from_aggregate(media_id, docs)
+
+    def get_speaker_maps(self, media_ids: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """Returns {media_id: {speaker_id: speaker}} with one query."""
+        docs = self.speakers_collection.find(*self._speaker_maps_query(media_ids))
+        return self._speaker_maps_from_docs(media_ids, docs)
+
+    def get_full_metadata_sequential(
+        self, media_id: str, subtitle_types: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Three-query variant of get_full_metadata (media, speakers, segments).
+        Baseline for the benchmark and fallback for media whose joined metadata
+        exceeds the 16 MB document limit: the segments are streamed by a cursor.
+        """
         debate = self.media_collection.find_one({"_id": media_id})
-        debate["media_id"] = str(debate.pop("_id"))
-        if not debate:
-            raise DocumentNotFoundError(f"Debate {media_id} not found")
+        speakers_doc = self.speakers_collection.find_one({"media_id": media_id})
+        cursor = self.segments_collection.find(
+            {"media_id": media_id}, self._segment_projection(subtitle_types)
+        ).sort(SEGMENTS_SORT)
+        return self._full_metadata_from_parts(media_id, debate, speakers_doc, cursor)
 
-        return debate
+    def get_debate_metadata(self, media_id: str) -> Dict[str, Any]:
+        return self._debate_from_doc(media_id, self.media_collection.find_one({"_id": media_id}))
 
 
     def update_speakers(self, media_id: str, speakers: List[Dict[str, Any]]):
@@ -156,15 +759,8 @@ class MongoManager:
         Expects 'speakers' to be a list of dicts:
         [{'speaker_id': '...', 'name': '...', 'role_tag': '...'}, ...]
         """
-        doc = {
-            "speakers": speakers,
-            "updated_at": datetime.utcnow()
-        }
-
-        self.speakers_collection.update_one(
-            {"media_id": media_id},
-            {"$set": doc}
-        )
+        self.speakers_collection.update_one({"media_id": media_id}, self._speakers_update(speakers))
+        self.cache.invalidate(media_id)
 
     def update_debate_details(self, media_id: str, update_data: Dict[str, Any]):
         """
@@ -178,50 +774,38 @@ class MongoManager:
             {"_id": media_id},
             {"$set": fields_to_set}
         )
+        self.cache.invalidate(media_id)
 
-    def update_subtitles(self, media_id: str, segment_nr: int, subtitle_type: str, subtitles: list[dict]):
+    def update_subtitles(
+        self, media_id: str, segment_nr: int, subtitle_type: str, subtitles: list[dict],
+        expected_version: Optional[int] = None,
+    ) -> int:
         """
         Updates the subtitle list for a specific segment.
         Target: 'segments' collection.
+        Returns the new version; raises SegmentVersionConflictError if the segment
+        is no longer at 'expected_version' and ValueError if it does not exist.
         """
-        if subtitle_type == self.type_original:
-            update_field = "subtitles_original"
-        elif subtitle_type == self.type_translation:
-            update_field = "subtitles_translation"
-        else:
-            raise ValueError(f"Unknown subtitle_type: {subtitle_type}")
-
-        result = self.segments_collection.update_one(
-            {
-                "media_id": media_id,
-                "segment_nr": segment_nr
-            },
-            {
-                "$set": {
-                    update_field: subtitles,
-                    "updated_at": datetime.utcnow()
-                }
-            }
+        query_filter, update = self._subtitle_update(
+            media_id, segment_nr, subtitle_type, subtitles, expected_version, datetime.utcnow()
+        )
+        version_field = self._version_field(subtitle_type)
+        segment = self.segments_collection.find_one_and_update(
+            query_filter, update, projection={version_field: 1}, return_document=ReturnDocument.AFTER
         )
 
-        if result.matched_count == 0:
-            raise ValueError(f"Segment {segment_nr} for media {media_id} not found.")
+        self.cache.invalidate(media_id)
+
+        if segment is None:
+            exists = self.segments_collection.count_documents(self._segment_filter(media_id, segment_nr), limit=1)
+            raise self._subtitle_update_error(media_id, [segment_nr], [segment_nr] if exists else [])
+        return segment[version_field]
 
     def insert_initial_media_document(
         self, media_id: str, s3_key: str, filename: str, media_type: str, status: str = "uploaded via dashboard"
     ):
         """First entry of the media in the db: assumes that upload to S3 already happened."""
-        document = {
-            "_id": media_id,
-            "s3_key": s3_key,
-            "original_filename": filename,
-            "media_type": media_type,
-            "status": status,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow(),
-            "error_message": None
-        }
-
+        document = self._initial_media_document(media_id, s3_key, filename, media_type, status)
         return self.media_collection.insert_one(document)
 
     def mark_failed(self, media_id: str, error_message: str):
@@ -237,22 +821,157 @@ class MongoManager:
             }}
         )
 
-    def get_all_media(self):
-        """Returns all media documents sorted by date"""
-        cursor = self.media_collection.find().sort("created_at", -1)
-        return list(cursor)
+    def get_media_ids(self, updated_since: Optional[datetime] = None) -> List[str]:
+        """
+        Returns the ids of all media, or of the media whose debate, speakers or
+        segments were changed since 'updated_since'.
+        """
+        if updated_since is None:
+            return sorted(str(doc["_id"]) for doc in self.media_collection.find({}, {"_id": 1}))
+
+        changed = {"updated_at": {"$gte": updated_since}}
+        media_ids = {str(doc["_id"]) for doc in self.media_collection.find(changed, {"_id": 1})}
+        media_ids.update(self.speakers_collection.distinct("media_id", changed))
+        media_ids.update(self.segments_collection.distinct("media_id", changed))
+        return sorted(media_ids)
+
+    def list_media(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        history_limit: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Returns one page of media documents, newest first, and the cursor of the next page.
+        Uses keyset pagination on (created_at, _id) and only projects the dashboard fields.
+        'history_limit' keeps the last N processing steps (0 omits the history).
+        """
+        query_filter, projection = self._media_list_query(cursor, status, history_limit)
+
+        docs = list(self.media_collection.find(query_filter, projection).sort(MEDIA_LIST_SORT).limit(limit + 1))
+
+        return self._media_list_page(docs, limit)
+
+    def count_media(self, status: Optional[str] = None) -> int:
+        """Number of media of the dashboard listing, over all pages."""
+        return self.media_collection.count_documents(self._media_status_filter(status))
+
+    def record_artifact(self, media_id: str, artifact: Dict[str, Any]):
+        """Adds or replaces the manifest entry of an S3 object written for the media."""
+        self.artifacts_collection.replace_one(
+            {"_id": artifact["key"]}, self._artifact_document(media_id, artifact), upsert=True
+        )
+        self.cache.invalidate(media_id)
+
+    def get_artifacts(self, media_id: str) -> List[Dict[str, Any]]:
+        """Returns the manifest of a media, ordered by key."""
+        return list(self.artifacts_collection.find({"media_id": media_id}, ARTIFACT_PROJECTION).sort(ARTIFACTS_SORT))
+
+    def get_artifact_media_ids(self) -> List[str]:
+        return sorted(self.artifacts_collection.distinct("media_id"))
+
+    def delete_artifacts(self, media_id: str, keys: List[str]) -> int:
+        """Removes manifest entries whose S3 objects no longer exist."""
+        if not keys:
+            return 0
+        result = self.artifacts_collection.delete_many({"media_id": media_id, "_id": {"$in": keys}})
+        self.cache.invalidate(media_id)
+        return result.deleted_count
 
     def delete_everything(self, media_id: str):
         """
         Deletes media doc AND all related speakers/subtitles/segments.
         """
-        self.speakers_collection.delete_one({"media_id": media_id})
-        self.subtitles_collection.delete_many({"media_id": media_id})
-        self.segments_collection.delete_one({"media_id": media_id})
-        self.media_collection.delete_one({"_id": media_id})
+        for collection, query_filter in self._media_delete_filters(media_id):
+            collection.delete_many(query_filter)
+        self.cache.invalidate(media_id)
         return True
 
 
+def encode_subtitles(subtitles: List[Dict], subtitle_format: str) -> Any:
+    """Converts a list of {start, end, text} subtitles into the given storage format."""
+    if subtitle_format == SUBTITLE_FORMAT_COLUMNAR:
+        return {
+            "starts": [s["start"] for s in subtitles],
+            "ends": [s["end"] for s in subtitles],
+            "texts": [s["text"] for s in subtitles],
+        }
+    return subtitles
+
+
+def decode_subtitles(value: Any) -> List[Dict]:
+    """
+    Converts stored subtitles of either format back into a list of {start, end, text}.
+    Columnar arrays of different lengths are corrupt and raise ValueError.
+    """
+    if isinstance(value, dict):
+        return [
+            {"start": start, "end": end, "text": text}
+            for start, end, text in zip(
+                value.get("starts", []), value.get("ends", []), value.get("texts", []), strict=True
+            )
+        ]
+    return value
+
+
+def is_document_too_large(error: OperationFailure) -> bool:
+    """True if an aggregation failed because a result document exceeds the BSON limit."""
+    return error.code in DOCUMENT_TOO_LARGE_CODES
+
+
+def decode_segment(segment: Dict[str, Any]) -> Dict[str, Any]:
+    """Converts the subtitle fields of a stored segment into the API shape (in place)."""
+    for field in SUBTITLE_FIELDS:
+        if field in segment:
+            segment[field] = decode_subtitles(segment[field])
+    return segment
+
+
+def _encode_cursor(created_at: datetime, last_id: str) -> str:
+    """Encodes the sort key of the last document of a page into an opaque cursor."""
+    payload = {
+        "created_at": created_at.isoformat() if created_at else None,
+        "id": last_id,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """Decodes a cursor created by _encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        created_at = payload["created_at"]
+        return (datetime.fromisoformat(created_at) if created_at else None), payload["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _winning_plan(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Winning plan of an explain() result. Queries on time-series collections run as
+    aggregation over the buckets: their plan sits in the $cursor stage of 'stages'.
+    """
+    if "queryPlanner" not in explain:
+        cursor_stage = next((stage["$cursor"] for stage in explain.get("stages", []) if "$cursor" in stage), None)
+        if cursor_stage is None:
+            raise IndexCheckError(f"Unexpected explain output with keys {list(explain)}")
+        explain = cursor_stage
+    winning_plan = explain["queryPlanner"]["winningPlan"]
+    # Slot based engine: the stage tree is under 'queryPlan'
+    return winning_plan.get("queryPlan", winning_plan)
+
+
+def _collect_plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Flattens the stages of an explain() plan tree."""
+    stages = [plan.get("stage")]
+    if "inputStage" in plan:
+        stages.extend(_collect_plan_stages(plan["inputStage"]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_collect_plan_stages(child))
+    return stages
+
+
 @lru_cache()
 def get_mongo_manager() -> MongoManager:
     return MongoManager()
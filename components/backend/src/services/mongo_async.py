@@ -0,0 +1,253 @@
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from pymongo import AsyncMongoClient, UpdateOne, ReturnDocument
+from pymongo.errors import OperationFailure
+from datetime import datetime
+from functools import lru_cache
+
+from services.mongo import (
+    BaseMongoManager, SegmentVersionConflictError, decode_segment, is_document_too_large,
+    ARTIFACT_PROJECTION, ARTIFACTS_SORT, MEDIA_LIST_SORT, SEGMENTS_SORT, SEGMENT_WINDOW_SORT, STATUS_EVENTS_SORT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMongoManager(BaseMongoManager):
+    """
+    Non-blocking counterpart of the MongoManager for the async routers.
+    Workers and the cli keep using the synchronous MongoManager.
+    """
+    client_class = AsyncMongoClient
+
+    async def get_full_metadata(self, media_id: str, subtitle_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Returns debate, speakers and sorted segments in one aggregation round trip.
+        Served from the metadata cache when possible: treat the result as read-only.
+        """
+        cache_key = self._full_metadata_cache_key(media_id, subtitle_types)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        pipeline = self._full_metadata_pipeline(media_id, subtitle_types)
+        try:
+            cursor = await self.media_collection.aggregate(pipeline)
+            docs = await cursor.to_list()
+        except OperationFailure as e:
+            if not is_document_too_large(e):
+                raise
+            logger.warning(f"media_id={media_id} - Metadata exceeds the BSON limit, loading it with three queries.")
+            metadata = await self.get_full_metadata_sequential(media_id, subtitle_types)
+        else:
+            metadata = self._full_metadata_from_aggregate(media_id, docs)
+
+        self.cache.set(cache_key, metadata)
+        return metadata
+
+    async def get_full_metadata_sequential(
+        self, media_id: str, subtitle_types: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Three-query variant of get_full_metadata (media, speakers, segments), for media
+        whose joined metadata exceeds the 16 MB document limit.
+        """
+        debate = await self.media_collection.find_one({"_id": media_id})
+        speakers_doc = await self.speakers_collection.find_one({"media_id": media_id})
+        cursor = self.segments_collection.find(
+            {"media_id": media_id}, self._segment_projection(subtitle_types)
+        ).sort(SEGMENTS_SORT)
+        return self._full_metadata_from_parts(media_id, debate, speakers_doc, await cursor.to_list())
+
+    async def get_segments_in_window(
+        self, media_id: str, from_time: float, to_time: float, subtitle_types: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the segments overlapping the time window [from_time, to_time], ordered by start.
+        """
+        cursor = self.segments_collection.find(
+            self._segment_window_filter(media_id, from_time, to_time),
+            self._segment_projection(subtitle_types),
+        ).sort(SEGMENT_WINDOW_SORT)
+        return [decode_segment(seg) for seg in await cursor.to_list()]
+
+    async def get_segments_by_range(
+        self, media_id: str, from_segment: int, to_segment: int, subtitle_types: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the segments with from_segment <= segment_nr <= to_segment, ordered by segment_nr.
+        """
+        cursor = self.segments_collection.find(
+            self._segment_range_filter(media_id, from_segment, to_segment),
+            self._segment_projection(subtitle_types),
+        ).sort(SEGMENTS_SORT)
+        return [decode_segment(seg) for seg in await cursor.to_list()]
+
+    async def get_debate_metadata(self, media_id: str) -> Dict[str, Any]:
+        """
+        Served from the metadata cache when possible: treat the result as read-only.
+        """
+        cache_key = self._debate_cache_key(media_id)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        debate = self._debate_from_doc(media_id, await self.media_collection.find_one({"_id": media_id}))
+
+        self.cache.set(cache_key, debate)
+        return debate
+
+    async def get_artifacts(self, media_id: str) -> List[Dict[str, Any]]:
+        """
+        Returns the manifest of a media, ordered by key.
+        Served from the metadata cache when possible: treat the result as read-only.
+        """
+        cache_key = self._artifacts_cache_key(media_id)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        cursor = self.artifacts_collection.find({"media_id": media_id}, ARTIFACT_PROJECTION).sort(ARTIFACTS_SORT)
+        artifacts = await cursor.to_list()
+
+        self.cache.set(cache_key, artifacts)
+        return artifacts
+
+    async def get_speaker_maps(self, media_ids: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """
+        Returns {media_id: {speaker_id: speaker}} for query-time speaker enrichment.
+        Served from the metadata cache when possible, missing media are loaded with one query.
+        """
+        speaker_maps = {}
+        missing = []
+        for media_id in dict.fromkeys(media_ids):
+            cached = self.cache.get(self._speaker_map_cache_key(media_id))
+            if cached is not None:
+                speaker_maps[media_id] = cached
+            else:
+                missing.append(media_id)
+
+        if missing:
+            cursor = self.speakers_collection.find(*self._speaker_maps_query(missing))
+            loaded = self._speaker_maps_from_docs(missing, await cursor.to_list())
+            for media_id, speaker_map in loaded.items():
+                self.cache.set(self._speaker_map_cache_key(media_id), speaker_map)
+            speaker_maps.update(loaded)
+
+        return speaker_maps
+
+    async def find_speaker_ids(self, attribute: str, value: str) -> Dict[str, List[str]]:
+        """Returns {media_id: [speaker_id, ...]} of all speakers whose attribute equals value."""
+        cursor = await self.speakers_collection.aggregate(self._speaker_pairs_pipeline(attribute, value))
+        return {doc["_id"]: doc["speaker_ids"] for doc in await cursor.to_list()}
+
+    async def get_status_events(self, media_id: str) -> List[Dict[str, Any]]:
+        """Returns the full processing history of a media, oldest first."""
+        cursor = self.status_events_collection.find({"media_id": media_id}, {"_id": 0}).sort(STATUS_EVENTS_SORT)
+        return await cursor.to_list()
+
+    async def update_speakers(self, media_id: str, speakers: List[Dict[str, Any]]):
+        """
+        Updates the speaker list with new names and roles.
+        """
+        await self.speakers_collection.update_one({"media_id": media_id}, self._speakers_update(speakers))
+        self.cache.invalidate(media_id)
+
+    async def update_subtitles(
+        self, media_id: str, segment_nr: int, subtitle_type: str, subtitles: list[dict],
+        expected_version: Optional[int] = None,
+    ) -> int:
+        """
+        Updates the subtitle list for a specific segment.
+        Returns the new version; raises SegmentVersionConflictError if the segment
+        is no longer at 'expected_version' and ValueError if it does not exist.
+        """
+        query_filter, update = self._subtitle_update(
+            media_id, segment_nr, subtitle_type, subtitles, expected_version, datetime.utcnow()
+        )
+        version_field = self._version_field(subtitle_type)
+        segment = await self.segments_collection.find_one_and_update(
+            query_filter, update, projection={version_field: 1}, return_document=ReturnDocument.AFTER
+        )
+
+        self.cache.invalidate(media_id)
+
+        if segment is None:
+            exists = await self.segments_collection.count_documents(
+                self._segment_filter(media_id, segment_nr), limit=1
+            )
+            raise self._subtitle_update_error(media_id, [segment_nr], [segment_nr] if exists else [])
+        return segment[version_field]
+
+    async def update_subtitles_batch(
+        self, media_id: str, subtitle_type: str, segments: List[Tuple[int, list, Optional[int]]]
+    ) -> Dict[int, int]:
+        """
+        Updates the subtitle lists of many segments with one bulk write.
+        'segments' holds (segment_nr, subtitles, expected_version) tuples.
+        The versions are checked before anything is written; a segment changed between
+        the check and the write raises SegmentVersionConflictError with 'partial' set.
+        Returns the new version of each segment.
+        """
+        segment_nrs = [segment_nr for segment_nr, _, _ in segments]
+        cursor = self.segments_collection.find(*self._segment_versions_query(media_id, segment_nrs, subtitle_type))
+        current = self._current_versions(media_id, subtitle_type, segments, await cursor.to_list())
+
+        current_time = datetime.utcnow()
+        operations = [
+            UpdateOne(*self._subtitle_update(
+                media_id, segment_nr, subtitle_type, subtitles, current[segment_nr], current_time
+            ))
+            for segment_nr, subtitles, _ in segments
+        ]
+        result = await self.segments_collection.bulk_write(operations, ordered=False)
+        self.cache.invalidate(media_id)
+
+        if result.matched_count != len(operations):
+            raise SegmentVersionConflictError(
+                f"Only {result.matched_count} of {len(operations)} segments of media {media_id} were updated.",
+                partial=result.matched_count > 0,
+            )
+        return {segment_nr: current[segment_nr] + 1 for segment_nr in segment_nrs}
+
+    async def insert_initial_media_document(
+        self, media_id: str, s3_key: str, filename: str, media_type: str, status: str = "uploaded via dashboard"
+    ):
+        """First entry of the media in the db: assumes that upload to S3 already happened."""
+        document = self._initial_media_document(media_id, s3_key, filename, media_type, status)
+        return await self.media_collection.insert_one(document)
+
+    async def list_media(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        history_limit: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Returns one page of media documents, newest first, and the cursor of the next page.
+        """
+        query_filter, projection = self._media_list_query(cursor, status, history_limit)
+
+        cursor = self.media_collection.find(query_filter, projection).sort(MEDIA_LIST_SORT).limit(limit + 1)
+        docs = await cursor.to_list()
+
+        return self._media_list_page(docs, limit)
+
+    async def count_media(self, status: Optional[str] = None) -> int:
+        """Number of media of the dashboard listing, over all pages."""
+        return await self.media_collection.count_documents(self._media_status_filter(status))
+
+    async def delete_everything(self, media_id: str):
+        """
+        Deletes media doc AND all related speakers/subtitles/segments.
+        """
+        for collection, query_filter in self._media_delete_filters(media_id):
+            await collection.delete_many(query_filter)
+        self.cache.invalidate(media_id)
+        return True
+
+
+@lru_cache()
+def get_async_mongo_manager() -> AsyncMongoManager:
+    return AsyncMongoManager()
@@ -2,11 +2,51 @@ import json
 import logging
 
 from typing import List, Dict, Union
-from models.search import SearchDocument
+from models.search import SearchDocument, SubtitleDocument
 
 logger = logging.getLogger(__name__)
 
 
+def build_document_id(media_id: str, segment_nr: int, subtitle_type: str) -> str:
+    """Deterministic Solr id of a segment document: {media_id}_{segment_nr-1}_{subtitle_type}"""
+    return f"{media_id}_{segment_nr - 1}_{subtitle_type}"
+
+
+def build_debate_document_id(media_id: str) -> str:
+    """Solr id of the debate parent document of a media (block join layout)"""
+    return f"{media_id}_debate"
+
+
+def build_speaker_key(media_id: str, speaker_id: str) -> str:
+    """Indexed (media_id, speaker_id) pair of a segment: filtered by query-time speakers"""
+    return f"{media_id}/{speaker_id}"
+
+
+def build_subtitle_document_id(segment_id: str, subtitle_index: int) -> str:
+    """Solr id of the subtitle document: {segment document id}_s{index in segment}"""
+    return f"{segment_id}_s{subtitle_index}"
+
+
+def parse_subtitles(
+    media_id: str, segment_nr: int, subtitle_type: str, subtitles: List[Dict]
+) -> List[SubtitleDocument]:
+    """One Solr document per subtitle of a segment, carrying its own start and end."""
+    segment_id = build_document_id(media_id, segment_nr, subtitle_type)
+    return [
+        SubtitleDocument(
+            id=build_subtitle_document_id(segment_id, index),
+            segment_id=segment_id,
+            media_id=media_id,
+            segment_nr=segment_nr,
+            statement=[sub.get("text", "")],
+            statement_type=subtitle_type,
+            start=sub["start"],
+            end=sub["end"],
+        )
+        for index, sub in enumerate(subtitles)
+    ]
+
+
 class JsonTranscriptParser:
     # ... enrich_subtitles remains exactly the same ...
     def enrich_subtitles(self, json_input: Union[str, bytes, List, Dict]) -> List[Dict]:
@@ -111,18 +151,21 @@ class JsonTranscriptParser:
 
         for seg in segments:
             index = seg.get('segment_nr', 1) - 1
-            unique_id = f"{media_id}_{index}_{subtitle_type}"
+            unique_id = build_document_id(media_id, index + 1, subtitle_type)
 
             # CHANGE: Extract just the text list for Solr indexing
             # Solr wants: ["Hello world", "How are you"]
             text_list = [s["text"] for s in seg.get("subtitles", [])]
 
+            speaker_id = seg.get("speaker_id", "UNKNOWN")
             doc = SearchDocument(
                 id=unique_id,
                 media_id=media_id,
                 segment_nr=seg.get('segment_nr', index + 1),
-                speaker_id=seg.get("speaker_id", "UNKNOWN"),
-                statement_language=seg.get("language", "en"),
+                speaker_id=speaker_id,
+                # Indexed only, not part of the search response
+                speaker_key=build_speaker_key(media_id, speaker_id),
+                statement_language=seg.get("language") or "en",
                 statement=text_list, # <--- Solr gets plain text list
                 statement_type=subtitle_type,
                 start=seg.get("start", 0.0),
@@ -132,6 +175,16 @@ class JsonTranscriptParser:
 
         return solr_docs
 
+    def parse_subtitle_documents(self, segments: List[Dict], media_id: str, subtitle_type: str) -> List[SubtitleDocument]:
+        """
+        Parses Segments into per-subtitle Solr documents (subtitle documents mode).
+        """
+        return [
+            doc
+            for seg in segments
+            for doc in parse_subtitles(media_id, seg.get("segment_nr", 1), subtitle_type, seg.get("subtitles", []))
+        ]
+
     def extract_speakers(self, segments: List[Dict]) -> List:
          # Helper to extract unique speakers for the separate speakers collection
          seen = set()
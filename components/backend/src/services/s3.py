@@ -1,11 +1,14 @@
 import boto3
+import mimetypes
 import os
+import time
 from botocore.client import Config
 from dotenv import load_dotenv
 import logging
 from functools import lru_cache
 from config.settings import get_settings
-from typing import List, Union, Dict, Any
+from services.cache import get_presigned_url_cache
+from typing import Callable, List, Optional, TypeVar, Union, Dict, Any
 from botocore.exceptions import (
     NoCredentialsError, DataNotFoundError, ClientError
 )
@@ -14,6 +17,15 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Entries of the presigned URL cache: single URLs and signed URL sets of a media
+URL_ENTRY = "url"
+URL_SET_ENTRY = "url_set"
+# Playable (inline) URLs are fetched with range requests during the whole playback:
+# served from the cache only while at least this share of their lifetime remains
+PLAYABLE_MIN_VALIDITY_RATIO = 0.5
+
+T = TypeVar("T")
+
 class S3Manager:
     def __init__(self):
         settings = get_settings()
@@ -54,6 +66,11 @@ class S3Manager:
             config=Config(s3={'addressing_style': 'path'}, signature_version='s3v4')
         )
 
+        # Signing is CPU bound (SigV4): URLs are reused until shortly before they expire
+        self.url_cache = get_presigned_url_cache()
+        self.url_expiry_margin = settings.s3_url_expiry_margin
+        self.url_set_ttl = settings.s3_url_set_ttl
+
     def get_presigned_url(self, object_key, as_attachment=False, expiration=3600):
         """
         Generates a presigned URL for accessing an S3 object.
@@ -71,7 +88,69 @@ class S3Manager:
 
         Returns:
             str: A public-facing HTTPS URL with a valid internal signature.
+
+        URLs are served from the presigned URL cache, keyed by (key, disposition, expiration),
+        until 's3_url_expiry_margin' seconds before they expire, playable (inline) URLs
+        until half their lifetime is left.
+        """
+        return self._cached_presigned_url(
+            object_key, as_attachment, expiration, self._min_validity(as_attachment, expiration)
+        )
+
+    def get_media_url_set(
+        self, media_id: str, variant: str, build: Callable[[Callable[[str, bool], Optional[str]]], T],
+        expiration: int = 3600,
+    ) -> T:
         """
+        Returns the signed URLs of a media (e.g. all files for the player), cached as a unit.
+        'build' lists the files and signs them with the passed sign(object_key, as_attachment).
+        The set is cached for 's3_url_set_ttl' seconds: its URLs are signed to stay valid
+        for at least the expiry margin (playable URLs: half their lifetime) until the set is dropped.
+        """
+        cache_key = (URL_SET_ENTRY, media_id, variant, expiration)
+        cached = self.url_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        ttl = min(self.url_set_ttl, expiration - self.url_expiry_margin)
+
+        def sign(object_key: str, as_attachment: bool = False) -> Optional[str]:
+            min_validity = self._min_validity(as_attachment, expiration) + max(ttl, 0)
+            return self._cached_presigned_url(object_key, as_attachment, expiration, min_validity)
+
+        url_set = build(sign)
+        if ttl > 0:
+            self.url_cache.set(cache_key, url_set, ttl=ttl)
+        return url_set
+
+    def invalidate_media_urls(self, media_id: str):
+        """Drops the cached URLs of a media after its files changed (this process only)."""
+        self.url_cache.invalidate(media_id)
+
+    def _min_validity(self, as_attachment: bool, expiration: int) -> float:
+        """Seconds a cached URL must stay valid to be served."""
+        if as_attachment:
+            return self.url_expiry_margin
+        return max(self.url_expiry_margin, expiration * PLAYABLE_MIN_VALIDITY_RATIO)
+
+    def _cached_presigned_url(
+        self, object_key: str, as_attachment: bool, expiration: int, min_validity: float
+    ) -> Optional[str]:
+        """Cached URL if it stays valid for at least 'min_validity' seconds, else a fresh one."""
+        media_id = object_key.split("/", 1)[0]
+        cache_key = (URL_ENTRY, media_id, object_key, as_attachment, expiration)
+        cached = self.url_cache.get(cache_key)
+        if cached is not None and cached["expires_at"] - time.monotonic() >= min_validity:
+            return cached["url"]
+
+        expires_at = time.monotonic() + expiration
+        url = self._sign_url(object_key, as_attachment, expiration)
+        ttl = expiration - self.url_expiry_margin
+        if url and ttl > 0:
+            self.url_cache.set(cache_key, {"url": url, "expires_at": expires_at}, ttl=ttl)
+        return url
+
+    def _sign_url(self, object_key, as_attachment=False, expiration=3600):
         # Generate URL using the SIGNING endpoint
         # The signature is now calculated for the correct expected Host
         try:
@@ -181,6 +260,33 @@ class S3Manager:
             logging.error(f"Error generating presigned POST: {e}")
             raise e
 
+    def head_artifact(self, s3_key: str) -> Dict[str, Any]:
+        """Manifest entry of an S3 object: key, size, etag and content type."""
+        response = self.s3.head_object(Bucket=self.bucket_name, Key=s3_key)
+        return {
+            "key": s3_key,
+            "size": response.get("ContentLength"),
+            "etag": response.get("ETag", "").strip('"'),
+            "content_type": response.get("ContentType"),
+        }
+
+    def list_artifacts(self, media_id: str) -> List[Dict[str, Any]]:
+        """
+        Lists all objects of a media (with size and etag, without content type).
+        Paginated, and the trailing slash keeps media ids sharing a prefix apart.
+        Only used to reconcile the manifests: reads are served from Mongo.
+        """
+        artifacts = []
+        paginator = self.s3.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=f"{media_id}/"):
+            for obj in page.get('Contents', []):
+                artifacts.append({
+                    "key": obj['Key'],
+                    "size": obj.get('Size'),
+                    "etag": obj.get('ETag', "").strip('"'),
+                })
+        return artifacts
+
     def download_file(self, s3_key: str, local_path: str):
         """Used by Workers to download source files"""
         try:
@@ -190,11 +296,18 @@ class S3Manager:
             logger.error(f"Failed to download {s3_key}: {e}")
             raise e
 
-    def upload_file(self, local_path: str, s3_key: str):
-        """Used by Workers to upload results"""
+    def upload_file(self, local_path: str, s3_key: str) -> Dict[str, Any]:
+        """
+        Used by Workers to upload results.
+        Returns the manifest entry of the written object (see head_artifact).
+        """
         try:
             logger.info(f"Uploading {local_path} -> {s3_key}")
-            self.s3.upload_file(local_path, self.bucket_name, s3_key)
+            content_type, _ = mimetypes.guess_type(s3_key)
+            extra_args = {"ContentType": content_type} if content_type else None
+            self.s3.upload_file(local_path, self.bucket_name, s3_key, ExtraArgs=extra_args)
+            self.invalidate_media_urls(s3_key.split("/", 1)[0])
+            return self.head_artifact(s3_key)
         except ClientError as e:
             logger.error(f"Failed to upload {s3_key}: {e}")
             raise e
@@ -217,6 +330,7 @@ class S3Manager:
                     Delete={'Objects': objects_to_delete}
                 )
                 logger.info(f"Deleted {len(objects_to_delete)} objects from S3 for {media_id}")
+            self.invalidate_media_urls(media_id)
         except Exception as e:
             logger.error(f"Failed to delete S3 folder {media_id}: {e}")
             # Don't raise, we want to continue deleting other resources
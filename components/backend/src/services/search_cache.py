@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from config.settings import get_settings
+from models.search import SearchQuery
+
+logger = logging.getLogger(__name__)
+
+# Redis keys shared by the API workers (search cache) and all Solr writers
+SEARCH_CACHE_PREFIX = "debates:search"
+INDEX_GENERATION_KEY = f"{SEARCH_CACHE_PREFIX}:generation"
+# Exists while a write is not yet visible in Solr (commitWithin / autoSoftCommit)
+INDEX_PENDING_KEY = f"{SEARCH_CACHE_PREFIX}:pending"
+STATS_KEY = f"{SEARCH_CACHE_PREFIX}:stats"
+# Global facet counts of the unfiltered search (landing page)
+FACET_SNAPSHOT_KEY = f"{SEARCH_CACHE_PREFIX}:facet_snapshot"
+FACET_SNAPSHOT_LOCK_KEY = f"{FACET_SNAPSHOT_KEY}:lock"
+
+
+def bump_index_generation(redis_conn: Redis, visible_after_ms: int = 0):
+    """
+    Invalidates all cached search results after a Solr write.
+    'visible_after_ms' is the delay until the write is committed: during that
+    window, extended by the time to open and warm the new searcher, results are
+    served but not stored, so no stale result is cached.
+    """
+    try:
+        pipe = redis_conn.pipeline()
+        pipe.incr(INDEX_GENERATION_KEY)
+        if visible_after_ms > 0:
+            pending_ms = visible_after_ms + get_settings().search_cache_visibility_margin_ms
+            pipe.set(INDEX_PENDING_KEY, 1, px=pending_ms)
+        pipe.execute()
+    except Exception as e:
+        # A failed bump must not fail the write: cached entries still expire with their TTL
+        logger.warning(f"Failed to bump search index generation: {e}")
+
+
+def read_index_state(redis_conn: Redis) -> Tuple[int, bool]:
+    """Returns the current index generation and whether writes are still becoming visible."""
+    raw_generation, pending = redis_conn.mget(INDEX_GENERATION_KEY, INDEX_PENDING_KEY)
+    return int(raw_generation or 0), pending is not None
+
+
+def store_facet_snapshot(redis_conn: Redis, snapshot: Dict[str, Any]):
+    redis_conn.set(FACET_SNAPSHOT_KEY, json.dumps(snapshot))
+
+
+def normalize_query(query: SearchQuery) -> Dict[str, Any]:
+    """Canonical form of a search query: equal searches map to the same cache key."""
+    return {
+        "q": (query.queryTerm or "").strip() or "*:*",
+        "fq": sorted({(f.facetField, f.facetValue) for f in query.facetFilters}),
+        # Request order: the facets are returned in this order
+        "facet": list(dict.fromkeys(query.facetFields or [])),
+        "sort": query.sortBy or "",
+        "start": query.start,
+        "rows": query.rows,
+        "fl": sorted(set(query.fields or [])),
+        "hl": [sorted(set(query.highlightFields or [])), query.highlightSnippets, query.highlightFragsize],
+        "compact": query.compact,
+        "cursor": query.cursor,
+        "json_facets": [query.dateGap, query.timeBucket, sorted(set(query.nestedFacets))],
+        "subtitle_hits": query.subtitleHits,
+        "filter_queries": sorted(query.filterQueries),
+    }
+
+
+class SearchCache:
+    """
+    Search result cache in Redis, shared by all API workers.
+    Entries carry the index generation they were computed for: any Solr write
+    bumps the generation and thereby invalidates all entries at once.
+    Identical concurrent queries are coalesced into one Solr request, within a
+    worker by a shared future and across workers by a short Redis lock.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.enabled = settings.search_cache_enabled
+        self.ttl = settings.search_cache_ttl
+        self.lock_ms = settings.search_cache_lock_ms
+        self.redis = AsyncRedis.from_url(settings.redis_url)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def make_key(self, query: SearchQuery) -> str:
+        normalized = json.dumps(normalize_query(query), sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return f"{SEARCH_CACHE_PREFIX}:result:{digest}"
+
+    async def get_or_compute(
+        self, query: SearchQuery, compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Returns the cached response for the query or computes and stores it.
+        The second value tells whether the response came from the cache.
+        """
+        if not self.enabled:
+            return await compute(), False
+
+        key = self.make_key(query)
+
+        # Coalesce within this worker
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            await self._incr("coalesced")
+            return await asyncio.shield(inflight), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response, cached = await self._get_or_compute(key, compute)
+            future.set_result(response)
+            return response, cached
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve it so a failure nobody waited for is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        generation, cached = await self._lookup(key)
+        if cached is not None:
+            return cached, True
+
+        lock_key = f"{key}:lock"
+        acquired = await self._safe(self.redis.set(lock_key, 1, nx=True, px=self.lock_ms))
+        if not acquired and acquired is not None:
+            # Another worker computes the same query: wait for its result
+            deadline = time.monotonic() + self.lock_ms / 1000
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                generation, cached = await self._lookup(key, count=False)
+                if cached is not None:
+                    await self._incr("coalesced")
+                    return cached, True
+
+        try:
+            start_time = time.perf_counter()
+            response = await compute()
+            latency_ms = (time.perf_counter() - start_time) * 1000
+
+            await self._incr("misses")
+            await self._store(key, generation, response, latency_ms)
+            return response, False
+        finally:
+            if acquired:
+                await self._safe(self.redis.delete(lock_key))
+
+    async def _lookup(self, key: str, count: bool = True) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Returns the current generation and the cached response if it is still valid."""
+        values = await self._safe(self.redis.mget(INDEX_GENERATION_KEY, key))
+        if values is None:
+            return 0, None
+
+        raw_generation, raw_entry = values
+        generation = int(raw_generation or 0)
+        if raw_entry is None:
+            return generation, None
+
+        entry = json.loads(raw_entry)
+        if entry["generation"] != generation:
+            return generation, None
+
+        if count:
+            pipe = self.redis.pipeline()
+            pipe.hincrby(STATS_KEY, "hits", 1)
+            pipe.hincrbyfloat(STATS_KEY, "saved_ms", entry["latency_ms"])
+            await self._safe(pipe.execute())
+        return generation, entry["response"]
+
+    async def _store(self, key: str, generation: int, response: Dict[str, Any], latency_ms: float):
+        # Writes not yet visible in Solr: the result may already be outdated
+        if await self._safe(self.redis.exists(INDEX_PENDING_KEY)):
+            return
+
+        entry = json.dumps({
+            "generation": generation,
+            "latency_ms": latency_ms,
+            "response": response,
+        })
+        await self._safe(self.redis.set(key, entry, ex=self.ttl))
+
+    async def get_facet_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the facet snapshot with its staleness: 'stale' is set when the index
+        changed since the snapshot was computed, 'pending' while writes are not yet visible.
+        """
+        values = await self._safe(self.redis.mget(INDEX_GENERATION_KEY, INDEX_PENDING_KEY, FACET_SNAPSHOT_KEY))
+        if values is None or values[2] is None:
+            return None
+
+        raw_generation, pending, raw_snapshot = values
+        snapshot = json.loads(raw_snapshot)
+        snapshot["stale"] = snapshot["generation"] != int(raw_generation or 0)
+        snapshot["pending"] = pending is not None
+        return snapshot
+
+    async def _incr(self, counter: str):
+        await self._safe(self.redis.hincrby(STATS_KEY, counter, 1))
+
+    async def _safe(self, awaitable):
+        """Redis problems degrade to cache misses instead of failing the search."""
+        try:
+            return await awaitable
+        except Exception as e:
+            logger.warning(f"Search cache unavailable: {e}")
+            return None
+
+    async def stats(self) -> Dict[str, Any]:
+        raw = await self._safe(self.redis.hgetall(STATS_KEY)) or {}
+        stats = {k.decode(): float(v) for k, v in raw.items()}
+        hits = int(stats.get("hits", 0))
+        misses = int(stats.get("misses", 0))
+        lookups = hits + misses
+        generation = await self._safe(self.redis.get(INDEX_GENERATION_KEY))
+        return {
+            "enabled": self.enabled,
+            "generation": int(generation or 0),
+            "hits": hits,
+            "misses": misses,
+            "coalesced": int(stats.get("coalesced", 0)),
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "saved_ms": stats.get("saved_ms", 0.0),
+        }
+
+
+@lru_cache()
+def get_search_cache() -> SearchCache:
+    return SearchCache()
@@ -1,10 +1,24 @@
+import json
 import logging
-from typing import List, Dict, Any
+import os
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from functools import lru_cache
-from pysolr import Solr
+import requests
+from pysolr import Solr, SolrError
+from redis import Redis
 from config.settings import get_settings
 
-from models.search import SearchQuery
+from models.search import (
+    SearchQuery, FacetField, FacetValue, SearchDocument, CompactSearchHit, JsonFacet, FacetBucket,
+)
+from services.parser import (
+    JsonTranscriptParser, build_document_id, build_debate_document_id, build_speaker_key, parse_subtitles,
+)
+from services.mongo import get_mongo_manager, LANGUAGE_FIELDS
+from services.search_cache import (
+    bump_index_generation, read_index_state, store_facet_snapshot, FACET_SNAPSHOT_LOCK_KEY,
+)
 
 
 DEBATE_DETAILS_MAPPING = {
@@ -16,87 +30,227 @@ DEBATE_DETAILS_MAPPING = {
     "link_agenda": "debate_link_agenda",
 }
 
-logger = logging.getLogger(__name__)
-
-class SolrManager:
-    def __init__(self):
-        settings = get_settings()
-        self.solr_url = settings.solr_url
-        self.client = Solr(self.solr_url, timeout=10)
-        logger.info(f"SolrManager initialized with URL: {self.solr_url}")
-
-    def update_speakers(self, media_id: str, speakers: List[Dict[str, Any]]):
-        """
-        Updates speaker information in Solr documents.
-        """
-        for speaker in speakers:
-            speaker_id = speaker["speaker_id"]
-            speaker_name = speaker.get("name", None)
-            speaker_role_tag = speaker.get("role_tag", None)
-            speaker_country = speaker.get("country", None)
-
-            query = f'speaker_id:{speaker_id} AND media_id:{media_id}'
-
-            results = self.client.search(query)
-
-            if results.hits > 0:
-                docs_to_update = []
-                for doc in results:
-                    updated_doc = {
-                        "id": doc["id"],
-                        "speaker_name": {"set": speaker_name},
-                        "speaker_role_tag": {"set": speaker_role_tag},
-                        "speaker_country": {"set": speaker_country},
-                    }
-                    docs_to_update.append(updated_doc)
+# Rows per request when paging through all documents of a query
+SOLR_PAGE_SIZE = 1000
+
+# Optimistic concurrency: _version_=1 requires the document to exist
+VERSION_MUST_EXIST = 1
+
+# Commit strategies for Solr writes
+COMMIT_HARD = "hard"
+COMMIT_SOFT = "soft"
+COMMIT_WITHIN = "commit_within"
+
+# Facets of the search page; their global counts are kept in the facet snapshot
+DEFAULT_FACET_FIELDS = [
+    "debate_date", "debate_timeslot", "statement_type", "debate_session",
+    "speaker_name", "speaker_role_tag", "speaker_country",
+]
+FACET_SNAPSHOT_LOCK_MS = 60000
+
+# Subtitle documents and debate parents (optional indexing modes) live next to the
+# segment documents: all segment queries exclude them
+DOC_TYPE_SUBTITLE = "subtitle"
+DOC_TYPE_DEBATE = "debate"
+SEGMENT_DOCS_FILTER = f"-doc_type:({DOC_TYPE_SUBTITLE} OR {DOC_TYPE_DEBATE})"
+
+# Block join layout: the debate fields are only stored on the debate parent,
+# its segments are labeled children in this relation
+DEBATE_FIELDS = list(DEBATE_DETAILS_MAPPING.values())
+DEBATE_SEGMENTS_KEY = "segments"
+# All root documents (debate parents, subtitle documents): the parent filter of block joins
+ROOT_DOCS_FILTER = "*:* -_nest_path_:*"
+# JSON facets counting the debate fields on the parents of the matching segments
+PARENT_FACET_PREFIX = "debate_parent."
+PARENT_FACET_LIMIT = 100
+
+# Query-time speakers: Solr field -> (speaker attribute in Mongo, multi-valued in the schema)
+SPEAKER_FIELDS = {
+    "speaker_name": ("name", False),
+    "speaker_role_tag": ("role_tag", True),
+    "speaker_country": ("country", True),
+}
+# JSON facet of the (media_id, speaker_id) pairs (speaker_key), aggregated into the speaker facets
+SPEAKER_PAIRS_FACET = "speaker_pairs"
+SPEAKER_KEY_FIELD = "speaker_key"
+# Like Solr's default facet.limit
+SPEAKER_FACET_LIMIT = 100
+
+# CoreAdmin calls (create, swap, unload) and bulk loads may take longer than queries
+CORE_ADMIN_TIMEOUT = 120
+
+# JSON Facet API: date gaps of the debate_date range facet and limits of nested term facets
+DATE_GAPS = {"day": "+1DAY", "month": "+1MONTH", "year": "+1YEAR"}
+TIME_RANGE_FIELDS = ["start", "end"]
+NESTED_FACET_SEPARATOR = ">"
+NESTED_FACET_LIMIT = 50
+
+# Stored fields returned by a search (fl): only what the response models expose
+SEARCH_DOCUMENT_FIELDS = list(SearchDocument.model_fields)
+COMPACT_HIT_FIELDS = [field for field in CompactSearchHit.model_fields if field != "snippets"]
+HIGHLIGHT_FIELDS = ["statement"]
+# Full mode returns whole highlighted values, compact mode bounded snippets
+FULL_HIGHLIGHT = {"hl.snippets": 1, "hl.fragsize": 0}
+COMPACT_HIGHLIGHT = {"hl.snippets": 3, "hl.fragsize": 160}
 
-                if docs_to_update:
-                    self.client.add(docs_to_update, commit=True)
+logger = logging.getLogger(__name__)
 
-    def update_segment(self, media_id: str, segment_nr: int, subtitles: List[dict], subtitle_type: str):
-        statement = [s.get("text", "") for s in subtitles]
 
-        query = f'statement_type:{subtitle_type} AND media_id:{media_id} AND segment_nr:{segment_nr}'
-        results = self.client.search(query)
+class BaseSolrManager:
+    """
+    Query building shared by the blocking SolrManager (writes, workers, cli)
+    and the AsyncSolrManager used by the search router.
+    """
 
-        if results.hits > 0:
-            docs_to_update = []
-            for doc in results:
-                updated_doc = {
-                    "id": doc["id"],
-                    "statement": {"set": statement},
-                }
-                docs_to_update.append(updated_doc)
+    def __init__(self):
+        self.settings = get_settings()
+        self.solr_url = self.settings.solr_url
+        self.query_time_speakers = self.settings.solr_query_time_speakers
+        self.debate_parents = self.settings.solr_debate_parents
 
-            if docs_to_update:
-                self.client.add(docs_to_update, commit=True)
+    def search_term(self, query: SearchQuery) -> str:
+        return query.queryTerm if query.queryTerm else "*:*"
 
-    def search(
-        self,
-        query: SearchQuery
-    ):
-        """Fetch search results from Solr"""
+    def search_params(self, query: SearchQuery) -> Dict[str, Any]:
+        """Solr request parameters of a search, without the query term."""
         params = {
             "wt": "json",
-            "indent": "true",
             "df": "statement",
+            "fl": ",".join(self.result_fields(query)),
             "hl": "true" if query.queryTerm else "false",
-            "hl.fragsize": 0,
             "rows": query.rows,
             "start": query.start,
         }
 
-        if query.facetFields:
+        if query.queryTerm:
+            params.update(COMPACT_HIGHLIGHT if query.compact else FULL_HIGHLIGHT)
+            params["hl.fl"] = ",".join(query.highlightFields or HIGHLIGHT_FIELDS)
+            if query.highlightSnippets is not None:
+                params["hl.snippets"] = query.highlightSnippets
+            if query.highlightFragsize is not None:
+                params["hl.fragsize"] = query.highlightFragsize
+
+        facet_fields = query.facetFields
+        speaker_facets = self.query_time_speakers and any(field in SPEAKER_FIELDS for field in facet_fields)
+        if self.query_time_speakers:
+            # Not indexed: computed from the speaker pairs facet
+            facet_fields = [field for field in facet_fields if field not in SPEAKER_FIELDS]
+        if query.dateGap:
+            # The range facet replaces the term facet with one bucket per timestamp
+            facet_fields = [field for field in facet_fields if field != "debate_date"]
+        if self.debate_parents:
+            # Not on the segments: counted on the debate parents by JSON facets
+            facet_fields = [field for field in facet_fields if field not in DEBATE_FIELDS]
+        if facet_fields:
             params["facet"] = "true"
-            params["facet.field"] = query.facetFields
+            params["facet.field"] = facet_fields
+
+        json_facet = self.json_facets(query)
+        if speaker_facets:
+            # Every pair: a truncated list would undercount the speaker values
+            json_facet[SPEAKER_PAIRS_FACET] = {"type": "terms", "field": SPEAKER_KEY_FIELD, "limit": -1}
+        if json_facet:
+            params["json.facet"] = json.dumps(json_facet)
+
+        params["fq"] = [SEGMENT_DOCS_FILTER] + self.build_filters(query.facetFilters) + query.filterQueries
+
+        if query.cursor:
+            # cursorMark requires start=0 and a sort ending on the uniqueKey
+            params["cursorMark"] = query.cursor
+            params["start"] = 0
+            params["sort"] = cursor_sort(query.sortBy)
+        elif query.sortBy:
+            params["sort"] = query.sortBy
 
-        if query.facetFilters:
-            params["fq"] = self.build_filters(query.facetFilters)
+        return params
 
-        if query.sortBy:
-            params["sort"] = query.sortBy
+    def json_facets(self, query: SearchQuery) -> Dict[str, Any]:
+        """
+        JSON Facet API requests: range facets on debate_date and start/end, and nested
+        term facets ('parent>child'), all computed in the same request as the search.
+        With debate parents the facets on debate fields count debates, not segments.
+        """
+        json_facet = {}
+        if query.dateGap:
+            json_facet["debate_date"] = {
+                "type": "range",
+                "field": "debate_date",
+                "start": self.settings.facet_date_range_start,
+                "end": self.settings.facet_date_range_end,
+                "gap": DATE_GAPS[query.dateGap.value],
+                "mincount": 1,
+            }
+            if self.debate_parents:
+                json_facet["debate_date"]["domain"] = {"blockParent": ROOT_DOCS_FILTER}
+
+        if self.debate_parents:
+            for field in query.facetFields:
+                if field not in DEBATE_FIELDS or (query.dateGap and field == "debate_date"):
+                    continue
+                # Counts debates: the parents of the matching segments
+                json_facet[f"{PARENT_FACET_PREFIX}{field}"] = {
+                    "type": "terms",
+                    "field": field,
+                    "limit": PARENT_FACET_LIMIT,
+                    "mincount": 1,
+                    "domain": {"blockParent": ROOT_DOCS_FILTER},
+                }
+
+        if query.timeBucket:
+            for field in TIME_RANGE_FIELDS:
+                json_facet[field] = {
+                    "type": "range",
+                    "field": field,
+                    "start": 0,
+                    "end": self.settings.facet_time_range_end,
+                    "gap": query.timeBucket,
+                    "mincount": 1,
+                }
+
+        for nested in query.nestedFacets:
+            facet = None
+            for field in reversed(nested.split(NESTED_FACET_SEPARATOR)):
+                term_facet = {"type": "terms", "field": field, "limit": NESTED_FACET_LIMIT}
+                if facet:
+                    term_facet["facet"] = facet
+                facet = {field: term_facet}
+            json_facet[nested] = next(iter(facet.values()))
 
-        return self.client.search(query.queryTerm if query.queryTerm else "*:*", **params)
+        return json_facet
+
+    def subtitle_hit_params(self, query: SearchQuery, segment_ids: List[str]) -> Dict[str, Any]:
+        """
+        Request parameters for the subtitle documents of the given segments that
+        match the query term, ordered by time.
+        """
+        segment_terms = " OR ".join(_quote(segment_id) for segment_id in segment_ids)
+        return {
+            "wt": "json",
+            "df": "statement",
+            "fq": [f"doc_type:{DOC_TYPE_SUBTITLE}", f"segment_id:({segment_terms})"],
+            "fl": "segment_id,start,end,statement",
+            # One group per segment with its first matching subtitles
+            "group": "true",
+            "group.field": "segment_id",
+            "group.limit": self.settings.solr_subtitle_hits_per_segment,
+            "group.sort": "start asc",
+            "rows": len(segment_ids),
+        }
+
+    def debate_parent_params(self, media_ids: List[str], fields: List[str]) -> Dict[str, Any]:
+        """Request parameters for the debate parents of the given media (block join layout)."""
+        media_terms = " OR ".join(_quote(media_id) for media_id in media_ids)
+        return {
+            "wt": "json",
+            "fq": [f"doc_type:{DOC_TYPE_DEBATE}", f"media_id:({media_terms})"],
+            "fl": ",".join(["media_id"] + fields),
+            "rows": len(media_ids),
+        }
+
+    def result_fields(self, query: SearchQuery) -> List[str]:
+        """The fl projection: the fields of the response model plus the requested extra fields."""
+        fields = COMPACT_HIT_FIELDS if query.compact else SEARCH_DOCUMENT_FIELDS
+        return list(dict.fromkeys(fields + (query.fields or [])))
 
     def build_filters(self, facet_filters: Dict[str, str]) -> List[str]:
         filter_queries = []
@@ -104,25 +258,325 @@ class SolrManager:
             field = f.facetField
             value = f.facetValue
 
+            # Query-time speakers: resolved into filterQueries by the API
+            if self.query_time_speakers and field in SPEAKER_FIELDS:
+                continue
+
+            # Range syntax, e.g. a bucket of a range facet: [2025-01-01T00:00:00Z TO 2025-02-01T00:00:00Z}
+            if value.startswith("[") and value.endswith(("]", "}")):
+                fq = f'{field}:{value}'
+
             # Special handling for debate_date (Date Range)
-            if field == "debate_date":
+            elif field == "debate_date":
                 # Assume value is "YYYY-MM-DD" or "YYYY-MM-DDTHH..."
                 # We strip it to the date part and create a 24-hour range
                 if len(value) >= 10:
                     date_str = value[:10]  # Take "2025-12-13"
                     # Create range covering the full day in UTC
                     fq = f'{field}:[{date_str}T00:00:00Z TO {date_str}T23:59:59Z]'
-                    filter_queries.append(fq)
                 else:
                     # Fallback if format is weird
-                    filter_queries.append(f'{field}:"{value}"')
+                    fq = f'{field}:"{value}"'
 
             else:
                 # Standard handling for text/string fields (Speakers, Language, etc.)
-                filter_queries.append(f'{field}:"{value}"')
+                fq = f'{field}:"{value}"'
+
+            # Block join layout: the segments of the matching debate parents
+            if self.debate_parents and field in DEBATE_FIELDS:
+                fq = f'{{!child of="{ROOT_DOCS_FILTER}"}}{fq}'
+            filter_queries.append(fq)
 
         return filter_queries
 
+
+class SolrManager(BaseSolrManager):
+    def __init__(self):
+        super().__init__()
+        settings = self.settings
+        self.client = Solr(self.solr_url, timeout=10)
+
+        self.commit_strategy = settings.solr_commit_strategy
+        self.commit_within_ms = settings.solr_commit_within_ms
+        self.editor_read_your_writes = settings.solr_editor_read_your_writes
+        self.update_chunk_size = settings.solr_update_chunk_size
+        self.subtitle_documents = settings.solr_subtitle_documents
+        self.auto_soft_commit_ms = settings.solr_auto_soft_commit_ms
+        # Only used to invalidate the shared search cache after writes
+        self.redis = Redis.from_url(settings.redis_url)
+        if self.commit_strategy not in (COMMIT_HARD, COMMIT_SOFT, COMMIT_WITHIN):
+            raise ValueError(f"Unknown Solr commit strategy: {self.commit_strategy}")
+        logger.info(f"SolrManager initialized with URL: {self.solr_url}")
+
+    def _commit_params(self, read_your_writes: bool = False, delete: bool = False) -> Dict[str, Any]:
+        """
+        Commit parameters for a write according to the configured strategy.
+        'read_your_writes' forces at least a soft commit so the change is searchable
+        when the call returns (used by the editor).
+        """
+        strategy = self.commit_strategy
+        if read_your_writes and strategy == COMMIT_WITHIN:
+            strategy = COMMIT_SOFT
+
+        if strategy == COMMIT_HARD:
+            return {"commit": True}
+        if strategy == COMMIT_SOFT:
+            return {"commit": False, "softCommit": True}
+        # pysolr's delete has no commitWithin: deletes become visible with the autoSoftCommit
+        if delete:
+            return {"commit": False}
+        return {"commit": False, "commitWithin": self.commit_within_ms}
+
+    def _invalidate_search_cache(self, commit_params: Dict[str, Any]):
+        """
+        Bumps the index generation after a write. Writes without an explicit commit
+        become visible with a delay, during which no search result is cached.
+        """
+        if commit_params.get("commit") or commit_params.get("softCommit"):
+            visible_after_ms = 0
+        else:
+            visible_after_ms = commit_params.get("commitWithin", self.auto_soft_commit_ms)
+        bump_index_generation(self.redis, visible_after_ms)
+
+    def add_documents(self, docs: List[Dict[str, Any]], read_your_writes: bool = False):
+        """
+        Adds or atomically updates documents using the configured commit strategy.
+        """
+        if not docs:
+            return
+        commit_params = self._commit_params(read_your_writes)
+        self.client.add(docs, **commit_params)
+        self._invalidate_search_cache(commit_params)
+
+    def add_documents_chunked(
+        self, docs: Iterable[Dict[str, Any]], chunk_size: int = None, read_your_writes: bool = False
+    ) -> int:
+        """
+        Sends documents in fixed-size add requests. Only the last request carries
+        the commit parameters, so a stream of updates results in a single commit.
+        Returns the number of sent documents.
+        """
+        chunk_size = chunk_size or self.update_chunk_size
+        sent = 0
+        pending = []
+        for doc in docs:
+            pending.append(doc)
+            # Keep one chunk back: the last one is sent with the commit
+            if len(pending) > chunk_size:
+                self.client.add(pending[:chunk_size], commit=False)
+                sent += chunk_size
+                pending = pending[chunk_size:]
+
+        if pending:
+            self.add_documents(pending, read_your_writes=read_your_writes)
+            sent += len(pending)
+        return sent
+
+    def _replace_debate_block(self, media_id: str) -> int:
+        """
+        Block join layout: an atomic update of a child re-indexes its whole block,
+        so edits of many segments rebuild the block from Mongo and add it once instead.
+        Blocking (Mongo and Solr): async handlers call it through the threadpool.
+        Returns the number of segment documents.
+        """
+        mongo = get_mongo_manager()
+        subtitle_fields = {
+            subtitle_type: mongo.subtitle_field(subtitle_type)
+            for subtitle_type in (self.settings.type_original, self.settings.type_translation)
+        }
+        block, = build_media_documents(
+            mongo.get_full_metadata(media_id), subtitle_fields, JsonTranscriptParser(),
+            query_time_speakers=self.query_time_speakers, debate_parents=True,
+        )
+        self.add_documents([block], read_your_writes=self.editor_read_your_writes)
+        return block_size(block) - 1
+
+    def iter_docs(self, query: str, fl: str = "id", page_size: int = SOLR_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Streams all documents matching a query using cursorMark deep paging.
+        Only the fields in 'fl' are fetched; memory stays bounded by 'page_size'.
+        """
+        cursor_mark = "*"
+        while True:
+            results = self.client.search(
+                query, fl=fl, sort="id asc", rows=page_size, cursorMark=cursor_mark
+            )
+            yield from results.docs
+
+            next_cursor_mark = results.nextCursorMark
+            if not next_cursor_mark or next_cursor_mark == cursor_mark:
+                break
+            cursor_mark = next_cursor_mark
+
+    def update_speakers(self, media_id: str, speakers: List[Dict[str, Any]]) -> int:
+        """
+        Updates speaker information in Solr documents.
+        Streams the ids of all documents of the given speakers with one cursor query
+        and sends the atomic updates in chunks with a single commit.
+        Returns the number of updated documents.
+        """
+        speakers_by_id = {speaker["speaker_id"]: speaker for speaker in speakers}
+        if not speakers_by_id:
+            return 0
+
+        if self.query_time_speakers:
+            # Speaker fields are resolved at query time: only cached responses are outdated
+            bump_index_generation(self.redis)
+            logger.info(f"media_id={media_id} - Speakers resolved at query time, no Solr documents rewritten.")
+            return 0
+
+        if self.debate_parents:
+            updated = self._replace_debate_block(media_id)
+            logger.info(f"media_id={media_id} - Re-indexed the debate block with {updated} Solr documents.")
+            return updated
+
+        speaker_terms = " OR ".join(_quote(speaker_id) for speaker_id in speakers_by_id)
+        query = f"media_id:{_quote(media_id)} AND speaker_id:({speaker_terms})"
+
+        def speaker_updates():
+            for doc in self.iter_docs(query, fl="id,speaker_id"):
+                speaker = speakers_by_id[doc["speaker_id"]]
+                yield {
+                    "id": doc["id"],
+                    "speaker_name": {"set": speaker.get("name", None)},
+                    "speaker_role_tag": {"set": speaker.get("role_tag", None)},
+                    "speaker_country": {"set": speaker.get("country", None)},
+                }
+
+        updated = self.add_documents_chunked(speaker_updates(), read_your_writes=self.editor_read_your_writes)
+
+        logger.info(f"media_id={media_id} - Updated {updated} Solr documents for {len(speakers_by_id)} speakers.")
+        return updated
+
+    def update_segment(self, media_id: str, segment_nr: int, subtitles: List[dict], subtitle_type: str):
+        """
+        Replaces the statement of one segment document without a preceding query.
+        """
+        self.update_segments(
+            media_id=media_id,
+            subtitle_type=subtitle_type,
+            segments=[(segment_nr, subtitles)],
+        )
+
+    def update_segments(self, media_id: str, subtitle_type: str, segments: List[Tuple[int, List[dict]]]) -> int:
+        """
+        Replaces the statements of many segment documents in one atomic update request.
+        'segments' holds (segment_nr, subtitles) tuples.
+        The document ids are derived like in the parser, so no query is needed.
+        The documents must exist (_version_=1), missing ones are re-indexed from Mongo.
+        Concurrent edits are detected in Mongo, before this write.
+        In the block join layout a single segment is updated as a child of its debate
+        block (routed by _root_), many segments rebuild the block from Mongo once.
+        """
+        if self.debate_parents and len(segments) > 1:
+            self._replace_debate_block(media_id)
+        else:
+            docs_to_update = [
+                {
+                    "id": build_document_id(media_id, segment_nr, subtitle_type),
+                    "statement": {"set": [s.get("text", "") for s in subtitles]},
+                    "_version_": VERSION_MUST_EXIST,
+                }
+                for segment_nr, subtitles in segments
+            ]
+            if self.debate_parents:
+                for doc in docs_to_update:
+                    doc["_root_"] = build_debate_document_id(media_id)
+            try:
+                self.add_documents(docs_to_update, read_your_writes=self.editor_read_your_writes)
+            except SolrError as e:
+                if not _is_missing_document(e):
+                    raise
+                # Mongo is already updated: index the documents from it instead
+                logger.warning(f"media_id={media_id} - Solr document missing for an edit, re-indexing from Mongo: {e}")
+                if self.debate_parents:
+                    self._replace_debate_block(media_id)
+                else:
+                    self._reindex_segments(media_id, subtitle_type, [segment_nr for segment_nr, _ in segments])
+
+        if self.subtitle_documents:
+            self._replace_subtitle_documents(media_id, subtitle_type, segments)
+
+        return len(segments)
+
+    def _reindex_segments(self, media_id: str, subtitle_type: str, segment_nrs: List[int]) -> int:
+        """
+        Re-creates segment documents from their Mongo state, for edits of
+        segments whose Solr document does not exist.
+        Returns the number of indexed documents.
+        """
+        mongo = get_mongo_manager()
+        segment_ids = {build_document_id(media_id, segment_nr, subtitle_type) for segment_nr in segment_nrs}
+        docs = [
+            doc
+            for doc in build_media_documents(
+                mongo.get_full_metadata(media_id), {subtitle_type: mongo.subtitle_field(subtitle_type)},
+                JsonTranscriptParser(), query_time_speakers=self.query_time_speakers,
+            )
+            if doc["id"] in segment_ids
+        ]
+        self.add_documents(docs, read_your_writes=self.editor_read_your_writes)
+        return len(docs)
+
+    def _replace_subtitle_documents(self, media_id: str, subtitle_type: str, segments: List[Tuple[int, List[dict]]]):
+        """Re-creates the subtitle documents of edited segments (subtitle documents mode)."""
+        segment_ids = [build_document_id(media_id, segment_nr, subtitle_type) for segment_nr, _ in segments]
+        segment_terms = " OR ".join(_quote(segment_id) for segment_id in segment_ids)
+        self.client.delete(q=f"doc_type:{DOC_TYPE_SUBTITLE} AND segment_id:({segment_terms})", commit=False)
+
+        subtitle_docs = [
+            doc.model_dump()
+            for segment_nr, subtitles in segments
+            for doc in parse_subtitles(media_id, segment_nr, subtitle_type, subtitles)
+        ]
+        self.add_documents(subtitle_docs, read_your_writes=self.editor_read_your_writes)
+
+    def search(
+        self,
+        query: SearchQuery
+    ):
+        """Fetch search results from Solr"""
+        return self.client.search(self.search_term(query), **self.search_params(query))
+
+    def refresh_facet_snapshot(self, facet_fields: List[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Computes the global facet counts of the unfiltered search and stores them in Redis.
+        Returns None if another refresh is already running.
+        A snapshot computed while writes are not yet visible gets no generation, so it
+        is reported stale and refreshed again later.
+        """
+        facet_fields = facet_fields or DEFAULT_FACET_FIELDS
+        if not self.redis.set(FACET_SNAPSHOT_LOCK_KEY, 1, nx=True, px=FACET_SNAPSHOT_LOCK_MS):
+            logger.info("Facet snapshot refresh already running, skipped.")
+            return None
+
+        try:
+            generation, pending = read_index_state(self.redis)
+            query = SearchQuery(
+                queryTerm="", sortBy="", facetFields=facet_fields, facetFilters=[], rows=0, start=0
+            )
+            raw = self.search(query).raw_response
+            apply_parent_facets(raw)
+            if self.query_time_speakers:
+                speaker_maps = get_mongo_manager().get_speaker_maps(speaker_media_ids(raw))
+                apply_speaker_maps(raw, speaker_maps, facet_fields)
+
+            snapshot = {
+                "generation": None if pending else generation,
+                "computed_at": datetime.utcnow().isoformat(),
+                "fields": facet_fields,
+                "total": raw.get("response", {}).get("numFound", 0),
+                "facets": [
+                    facet.model_dump()
+                    for facet in parse_facet_fields(raw.get("facet_counts", {}).get("facet_fields", {}))
+                ],
+            }
+            store_facet_snapshot(self.redis, snapshot)
+            logger.info(f"Facet snapshot refreshed for generation {snapshot['generation']}.")
+            return snapshot
+        finally:
+            self.redis.delete(FACET_SNAPSHOT_LOCK_KEY)
+
     def delete_by_media_id(self, media_id: str):
         """
         Deletes all segments associated with a specific media_id.
@@ -132,67 +586,380 @@ class SolrManager:
         logger.info(f"Deleting Solr documents for query: {query}")
 
         try:
-            self.client.delete(q=query, commit=True)
+            commit_params = self._commit_params(delete=True)
+            self.client.delete(q=query, **commit_params)
+            self._invalidate_search_cache(commit_params)
         except Exception as e:
             logger.error(f"Failed to delete documents for {media_id} from Solr: {e}")
             raise e
 
-    def update_debate_details(self, media_id: str, details: Dict[str, Any]):
+    def _core_admin(self, action: str, **params) -> Dict[str, Any]:
+        """
+        Calls the CoreAdmin API. Solr runs standalone (no SolrCloud collections or
+        aliases), so blue/green rebuilds work on cores and swap them by name.
+        """
+        base_url, _ = split_solr_url(self.solr_url)
+        response = requests.get(
+            f"{base_url}/admin/cores",
+            params={"action": action, "wt": "json", **params},
+            timeout=CORE_ADMIN_TIMEOUT,
+        )
+        if response.status_code != 200:
+            raise SolrError(f"CoreAdmin {action} failed with {response.status_code}: {response.text[:500]}")
+        return response.json()
+
+    def core_exists(self, name: str) -> bool:
+        return bool(self._core_status(name))
+
+    def core_instance_dir(self, name: str) -> Optional[str]:
+        """Name of the instance directory of a core (below the Solr home), None if not loaded."""
+        instance_dir = self._core_status(name).get("instanceDir")
+        return os.path.basename(instance_dir.rstrip("/")) if instance_dir else None
+
+    def _core_status(self, name: str) -> Dict[str, Any]:
+        return self._core_admin("STATUS", core=name).get("status", {}).get(name) or {}
+
+    def create_core(self, name: str, instance_dir: str):
+        """Creates an empty core with the schema and config of the configured configset."""
+        self._core_admin("CREATE", name=name, instanceDir=instance_dir, configSet=self.settings.solr_configset)
+        logger.info(f"Created Solr core {name} in {instance_dir}")
+
+    def swap_cores(self, core: str, other: str):
+        """Atomically exchanges the names of two cores; searches switch to the other index."""
+        self._core_admin("SWAP", core=core, other=other)
+        bump_index_generation(self.redis)
+        logger.info(f"Swapped Solr cores {core} and {other}")
+
+    def unload_core(self, name: str):
+        """
+        Unloads a core and deletes its index and data. The instance directory is kept:
+        rebuilds reuse it, and removing the precreated one would make solr-precreate
+        create a second core of the live name on the next container start.
+        """
+        self._core_admin("UNLOAD", core=name, deleteIndex="true", deleteDataDir="true")
+        logger.info(f"Unloaded Solr core {name}")
+
+    def client_for_core(self, name: str) -> Solr:
+        base_url, _ = split_solr_url(self.solr_url)
+        return Solr(f"{base_url}/{name}", timeout=CORE_ADMIN_TIMEOUT)
+
+    def update_debate_details(self, media_id: str, details: Dict[str, Any]) -> int:
         """
         Generic method to update debate metadata on ALL segments for a given media_id.
         Driven by DEBATE_DETAILS_MAPPING configuration.
+        Returns the number of updated documents.
         """
         # Build the Atomic Update Payload dynamically
-        solr_updates = {}
-
-        for api_field, solr_field in DEBATE_DETAILS_MAPPING.items():
-            # Skip if field is missing from input
-            if api_field not in details or details[api_field] is None:
-                continue
-
-            value = details[api_field]
-
-            # --- FIX: Date Normalization ---
-            # Solr requires "YYYY-MM-DDThh:mm:ssZ", but inputs might be "YYYY-MM-DD"
-            # We detect this pattern and append the time component.
-            if isinstance(value, str) and len(value) == 10:
-                # Basic check: does it look like 2026-01-01?
-                if value[4] == '-' and value[7] == '-':
-                     value = f"{value}T00:00:00Z"
-            # -------------------------------
-
-            solr_updates[solr_field] = {"set": value}
+        solr_updates = {field: {"set": value} for field, value in debate_fields(details).items()}
 
         if not solr_updates:
             logger.info("No mapped fields found to update in Solr.")
-            return
+            return 0
 
         logger.info(f"Updating Solr metadata for {media_id}: {solr_updates}")
 
-        # Fetch all Segment IDs for this Media
+        if self.debate_parents:
+            return self._update_debate_parent(media_id, solr_updates)
+
+        # Stream all Segment IDs for this Media and update them in chunks
         # Note: We only need the ID to target the update
-        query = f"media_id:{media_id}"
-        results = self.client.search(query, fl="id", rows=10000)
+        def debate_updates():
+            for doc in self.iter_docs(f"media_id:{_quote(media_id)} AND {SEGMENT_DOCS_FILTER}", fl="id"):
+                update_doc = {"id": doc["id"]}
+                update_doc.update(solr_updates)
+                yield update_doc
 
-        if len(results) == 0:
-            logger.warning(f"No Solr documents found for media_id: {media_id}")
-            return
+        try:
+            updated = self.add_documents_chunked(debate_updates(), read_your_writes=self.editor_read_your_writes)
+        except Exception as e:
+            logger.error(f"Solr batch update failed: {e}")
+            raise e
 
-        # Apply the updates to every segment
-        batch_update = []
-        for doc in results:
-            update_doc = {"id": doc["id"]}
-            update_doc.update(solr_updates)
-            batch_update.append(update_doc)
+        if updated == 0:
+            logger.warning(f"No Solr documents found for media_id: {media_id}")
+        else:
+            logger.info(f"Updated {updated} documents in Solr.")
+        return updated
+
+    def _update_debate_parent(self, media_id: str, solr_updates: Dict[str, Any]) -> int:
+        """Block join layout: the debate fields live on the parent only, one atomic update."""
+        parent_update = {
+            "id": build_debate_document_id(media_id),
+            **solr_updates,
+            "_version_": VERSION_MUST_EXIST,
+        }
+        try:
+            self.add_documents([parent_update], read_your_writes=self.editor_read_your_writes)
+        except SolrError as e:
+            if _is_missing_document(e):
+                logger.warning(f"No Solr debate document found for media_id: {media_id}")
+                return 0
+            logger.error(f"Solr debate update failed: {e}")
+            raise e
 
-        # Commit
-        if batch_update:
-            try:
-                self.client.add(batch_update, commit=True)
-                logger.info(f"Updated {len(batch_update)} documents in Solr.")
-            except Exception as e:
-                logger.error(f"Solr batch update failed: {e}")
-                raise e
+        logger.info(f"media_id={media_id} - Updated the debate document in Solr.")
+        return 1
+
+
+def debate_fields(details: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Maps debate details (API/Mongo field names) to their Solr fields.
+    Driven by DEBATE_DETAILS_MAPPING; missing and empty fields are skipped.
+    """
+    fields = {}
+    for api_field, solr_field in DEBATE_DETAILS_MAPPING.items():
+        # Skip if field is missing from input
+        if api_field not in details or details[api_field] is None:
+            continue
+
+        value = details[api_field]
+
+        # --- FIX: Date Normalization ---
+        # Solr requires "YYYY-MM-DDThh:mm:ssZ", but inputs might be "YYYY-MM-DD"
+        # We detect this pattern and append the time component.
+        if isinstance(value, str) and len(value) == 10:
+            # Basic check: does it look like 2026-01-01?
+            if value[4] == '-' and value[7] == '-':
+                 value = f"{value}T00:00:00Z"
+        # -------------------------------
+
+        fields[solr_field] = value
+    return fields
+
+
+def build_debate_block(
+    media_id: str, debate_values: Dict[str, Any], segment_docs: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Debate parent document with the segment documents as children (block join layout).
+    The block is indexed as a whole: adding it replaces all previous segments of the media.
+    """
+    children = [
+        {field: value for field, value in doc.items() if value is not None and field not in DEBATE_FIELDS}
+        for doc in segment_docs
+    ]
+    return {
+        "id": build_debate_document_id(media_id),
+        "doc_type": DOC_TYPE_DEBATE,
+        "media_id": media_id,
+        **debate_values,
+        DEBATE_SEGMENTS_KEY: children,
+    }
+
+
+def build_media_documents(
+    metadata: Dict[str, Any], subtitle_fields: Dict[str, str], parser: JsonTranscriptParser,
+    subtitle_documents: bool = False, query_time_speakers: bool = False, debate_parents: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Builds the complete Solr documents of a media from its Mongo state:
+    segments of each subtitle type, enriched with the speaker and debate fields
+    that are otherwise set by atomic updates from the editor.
+    With query-time speakers only the speaker_id is indexed, with debate parents
+    the segments are children of one debate document holding the debate fields.
+    Segments stored without a language take the language of the media.
+    """
+    debate = metadata["debate"]
+    media_id = debate["media_id"]
+    speakers_by_id = {speaker.get("speaker_id"): speaker for speaker in metadata["speakers"]}
+    debate_values = debate_fields(debate)
+
+    docs = []
+    segment_docs = []
+    for subtitle_type, field in subtitle_fields.items():
+        language_field = LANGUAGE_FIELDS[field]
+        media_language = debate.get(language_field)
+        segments = [
+            {**segment, "subtitles": segment[field], "language": segment.get(language_field) or media_language}
+            for segment in metadata["segments"]
+            if segment.get(field)
+        ]
+        for search_doc in parser.parse(segments, media_id, subtitle_type):
+            doc = search_doc.model_dump()
+            speaker = speakers_by_id.get(doc["speaker_id"])
+            if speaker and not query_time_speakers:
+                doc["speaker_name"] = speaker.get("name")
+                doc["speaker_role_tag"] = speaker.get("role_tag")
+                doc["speaker_country"] = speaker.get("country")
+            doc.update(debate_values)
+            segment_docs.append(doc)
+
+        if subtitle_documents:
+            docs.extend(doc.model_dump() for doc in parser.parse_subtitle_documents(segments, media_id, subtitle_type))
+
+    if debate_parents:
+        return [build_debate_block(media_id, debate_values, segment_docs)] + docs
+    return segment_docs + docs
+
+
+def block_size(doc: Dict[str, Any]) -> int:
+    """Number of Solr documents of an added document, including its children."""
+    return 1 + len(doc.get(DEBATE_SEGMENTS_KEY, []))
+
+
+def split_solr_url(solr_url: str) -> Tuple[str, str]:
+    """Splits a core url (http://solr:8983/solr/debates) into Solr base url and core name."""
+    base_url, core = solr_url.rstrip("/").rsplit("/", 1)
+    return base_url, core
+
+
+def parse_facet_fields(raw_facet_fields: Dict[str, List[Any]]) -> List[FacetField]:
+    """Converts Solr's flat [label, count, ...] facet lists, dropping empty values and fields."""
+    clean_facets = []
+    for field, flat_values in raw_facet_fields.items():
+        facet_values_list = []
+        for i in range(0, len(flat_values), 2):
+            label = flat_values[i]
+            count = flat_values[i+1]
+            if count > 0:
+                facet_values_list.append(FacetValue(label=str(label), count=count))
+
+        if facet_values_list:
+            clean_facets.append(FacetField(field_name=field, values=facet_values_list))
+    return clean_facets
+
+
+def parse_json_facets(raw_facets: Dict[str, Any]) -> List[JsonFacet]:
+    """Converts the JSON Facet API response (or a bucket of it) into nested facets."""
+    json_facets = []
+    for name, value in raw_facets.items():
+        if not isinstance(value, dict) or "buckets" not in value:
+            continue
+        buckets = [
+            FacetBucket(value=str(bucket["val"]), count=bucket["count"], facets=parse_json_facets(bucket))
+            for bucket in value["buckets"]
+        ]
+        json_facets.append(JsonFacet(name=name, buckets=buckets))
+    return json_facets
+
+
+def speaker_filter_query(speaker_ids_by_media: Dict[str, List[str]]) -> str:
+    """
+    Filter query matching the segments of the given speakers of each media.
+    A terms query on the speaker keys: not bound by maxBooleanClauses.
+    """
+    if not speaker_ids_by_media:
+        # No such speaker: match nothing
+        return "-*:*"
+    keys = [
+        build_speaker_key(media_id, speaker_id)
+        for media_id, speaker_ids in speaker_ids_by_media.items()
+        for speaker_id in speaker_ids
+    ]
+    return f"{{!terms f={SPEAKER_KEY_FIELD}}}{','.join(keys)}"
+
+
+def speaker_pairs(raw: Dict[str, Any]) -> List[Tuple[str, str, int]]:
+    """(media_id, speaker_id, count) of the speaker pairs facet."""
+    pairs = raw.get("facets", {}).get(SPEAKER_PAIRS_FACET, {})
+    return [
+        (*bucket["val"].split("/", 1), bucket["count"])
+        for bucket in pairs.get("buckets", [])
+        if "/" in bucket["val"]
+    ]
+
+
+def speaker_media_ids(raw: Dict[str, Any]) -> List[str]:
+    """Media ids whose speaker maps are needed to enrich a search response."""
+    media_ids = [doc["media_id"] for doc in raw.get("response", {}).get("docs", []) if "media_id" in doc]
+    media_ids.extend(media_id for media_id, _, _ in speaker_pairs(raw))
+    return list(dict.fromkeys(media_ids))
+
+
+def apply_speaker_maps(raw: Dict[str, Any], speaker_maps: Dict[str, Dict[str, Dict]], facet_fields: List[str]):
+    """
+    Query-time speakers: sets the speaker fields of the returned documents and
+    turns the speaker pairs facet into regular facet fields (in place).
+    """
+    def speaker_value(media_id, speaker_id, field):
+        attribute, multi_valued = SPEAKER_FIELDS[field]
+        value = speaker_maps.get(media_id, {}).get(speaker_id, {}).get(attribute)
+        if not value:
+            return None
+        return [value] if multi_valued else value
+
+    for doc in raw.get("response", {}).get("docs", []):
+        for field in SPEAKER_FIELDS:
+            doc[field] = speaker_value(doc.get("media_id"), doc.get("speaker_id"), field)
+
+    if SPEAKER_PAIRS_FACET not in raw.get("facets", {}):
+        return
+    pairs = speaker_pairs(raw)
+    del raw["facets"][SPEAKER_PAIRS_FACET]
+
+    raw_facet_fields = raw.setdefault("facet_counts", {}).setdefault("facet_fields", {})
+    for field in facet_fields:
+        if field not in SPEAKER_FIELDS:
+            continue
+        counts: Dict[str, int] = {}
+        for media_id, speaker_id, count in pairs:
+            value = speaker_value(media_id, speaker_id, field)
+            label = value[0] if isinstance(value, list) else value
+            if label:
+                counts[label] = counts.get(label, 0) + count
+
+        top = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:SPEAKER_FACET_LIMIT]
+        # Solr's flat [label, count, ...] format
+        raw_facet_fields[field] = [part for item in top for part in item]
+
+
+def apply_parent_facets(raw: Dict[str, Any]):
+    """
+    Block join layout: turns the facets counted on the debate parents into
+    regular facet fields (in place).
+    """
+    raw_facets = raw.get("facets", {})
+    raw_facet_fields = None
+    for name in [name for name in raw_facets if name.startswith(PARENT_FACET_PREFIX)]:
+        buckets = raw_facets.pop(name).get("buckets", [])
+        if raw_facet_fields is None:
+            raw_facet_fields = raw.setdefault("facet_counts", {}).setdefault("facet_fields", {})
+        # Solr's flat [label, count, ...] format
+        raw_facet_fields[name[len(PARENT_FACET_PREFIX):]] = [
+            part for bucket in buckets for part in (bucket["val"], bucket["count"])
+        ]
+
+
+def apply_debate_parents(raw: Dict[str, Any], parents: Dict[str, Dict[str, Any]]):
+    """Block join layout: copies the debate fields of the parents onto the returned segments (in place)."""
+    for doc in raw.get("response", {}).get("docs", []):
+        doc.update(parents.get(doc.get("media_id"), {}))
+
+
+def parse_subtitle_hits(raw: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Converts the grouped subtitle hit response into {segment_id: [{start, end, text}]}."""
+    groups = raw.get("grouped", {}).get("segment_id", {}).get("groups", [])
+    return {
+        group["groupValue"]: [
+            {"start": doc["start"], "end": doc["end"], "text": " ".join(doc.get("statement", []))}
+            for doc in group["doclist"]["docs"]
+        ]
+        for group in groups
+    }
+
+
+def cursor_sort(sort_by: Optional[str]) -> str:
+    """Adds the uniqueKey as tiebreaker, so that cursorMark paging is deterministic."""
+    sort_by = (sort_by or "score desc").strip()
+    sort_fields = [clause.split()[0] for clause in sort_by.split(",") if clause.strip()]
+    if "id" in sort_fields:
+        return sort_by
+    return f"{sort_by}, id asc"
+
+
+def _quote(value: str) -> str:
+    """Quotes a value as Solr phrase term."""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _is_missing_document(error: SolrError) -> bool:
+    """
+    Solr reports a missing document of a _version_=1 update as version conflict
+    against the actual version -1.
+    """
+    message = str(error)
+    return "version conflict" in message and "actual=-1" in message
 
 
 @lru_cache()
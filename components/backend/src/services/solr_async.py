@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List
+from urllib.parse import urlencode
+
+import httpx
+from pysolr import Results, SolrError
+
+from models.search import SearchQuery
+from services.solr import (
+    BaseSolrManager, DEBATE_FIELDS, parse_subtitle_hits, apply_parent_facets, apply_debate_parents,
+)
+
+logger = logging.getLogger(__name__)
+
+# Transient upstream statuses worth retrying for idempotent requests
+RETRY_STATUS_CODES = {502, 503, 504}
+RETRY_BACKOFF_SECONDS = 0.1
+# Longer parameters (e.g. speaker filters of many media) are sent as POST body:
+# Jetty rejects request headers above 8 KB
+MAX_GET_PARAMS_LENGTH = 4096
+
+
+class AsyncSolrManager(BaseSolrManager):
+    """
+    Non-blocking search client for the async routers, on a pooled HTTP/1.1
+    keep-alive connection pool. Writes keep going through the SolrManager.
+    """
+
+    def __init__(self):
+        super().__init__()
+        settings = self.settings
+        self.retries = settings.solr_http_retries
+        self.client = httpx.AsyncClient(
+            base_url=self.solr_url.rstrip("/"),
+            limits=httpx.Limits(
+                max_connections=settings.solr_http_pool_size,
+                max_keepalive_connections=settings.solr_http_pool_size,
+                keepalive_expiry=settings.solr_http_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                settings.solr_http_read_timeout,
+                connect=settings.solr_http_connect_timeout,
+            ),
+        )
+        logger.info(f"AsyncSolrManager initialized with URL: {self.solr_url}")
+
+    async def search(self, query: SearchQuery) -> Results:
+        """Fetch search results from Solr"""
+        params = {"q": self.search_term(query), **self.search_params(query)}
+        raw = await self._select(params)
+        if self.debate_parents:
+            apply_parent_facets(raw)
+            await self._load_debate_parents(query, raw)
+        return Results(raw)
+
+    async def _load_debate_parents(self, query: SearchQuery, raw: Dict[str, Any]):
+        """
+        Block join layout: the returned segments carry no debate fields, they are
+        fetched from the debate parents with one request.
+        """
+        fields = [field for field in self.result_fields(query) if field in DEBATE_FIELDS]
+        media_ids = list(dict.fromkeys(
+            doc["media_id"] for doc in raw.get("response", {}).get("docs", []) if "media_id" in doc
+        ))
+        if not fields or not media_ids:
+            return
+        parents = await self._select({"q": "*:*", **self.debate_parent_params(media_ids, fields)})
+        apply_debate_parents(raw, {
+            parent.pop("media_id"): parent for parent in parents.get("response", {}).get("docs", [])
+        })
+
+    async def search_subtitle_hits(self, query: SearchQuery, segment_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Returns the subtitles matching the query term within the given segments,
+        keyed by segment id (requires the subtitle documents indexing mode).
+        """
+        if not segment_ids:
+            return {}
+        params = {"q": self.search_term(query), **self.subtitle_hit_params(query, segment_ids)}
+        return parse_subtitle_hits(await self._select(params))
+
+    async def _select(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        GET on the select handler, POST (form body) for parameters too long for the
+        request line. Searches are idempotent, so connection errors, timeouts and
+        transient 5xx answers are retried.
+        """
+        use_post = len(urlencode(params, doseq=True)) > MAX_GET_PARAMS_LENGTH
+        attempt = 0
+        while True:
+            try:
+                if use_post:
+                    response = await self.client.post("/select", data=params)
+                else:
+                    response = await self.client.get("/select", params=params)
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.retries:
+                    break
+                logger.warning(f"Solr returned {response.status_code}, retrying ({attempt + 1}/{self.retries}).")
+            except httpx.TransportError as e:
+                if attempt >= self.retries:
+                    raise SolrError(f"Solr request failed: {e}") from e
+                logger.warning(f"Solr request failed: {e}, retrying ({attempt + 1}/{self.retries}).")
+
+            attempt += 1
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * attempt)
+
+        if response.status_code != 200:
+            raise SolrError(f"Solr responded with {response.status_code}: {response.text[:500]}")
+        return response.json()
+
+    async def close(self):
+        await self.client.aclose()
+
+
+@lru_cache()
+def get_async_solr_manager() -> AsyncSolrManager:
+    return AsyncSolrManager()
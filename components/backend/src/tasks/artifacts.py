@@ -0,0 +1,71 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from services.mongo import get_mongo_manager
+from services.s3 import get_s3_manager
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_artifacts(media_ids: Optional[List[str]] = None, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Reconciles the artifact manifests in Mongo with the objects in S3:
+    1.Objects missing in the manifest are recorded (HEAD for the content type)
+    2.Entries whose object changed (etag or size) are refreshed
+    3.Entries of objects that no longer exist are removed
+    Without 'media_ids' all media known to Mongo are checked and S3 folders
+    without a media are reported. 'dry_run' only counts the differences.
+    """
+    s3 = get_s3_manager()
+    mongo = get_mongo_manager()
+
+    full_run = media_ids is None
+    if full_run:
+        media_ids = sorted(set(mongo.get_media_ids()) | set(mongo.get_artifact_media_ids()))
+
+    summary = {"media": 0, "added": 0, "updated": 0, "removed": 0, "unchanged": 0, "failed": [], "orphaned": []}
+    for media_id in media_ids:
+        try:
+            in_s3 = {obj["key"]: obj for obj in s3.list_artifacts(media_id)}
+            in_manifest = {entry["key"]: entry for entry in mongo.get_artifacts(media_id)}
+
+            changed = []
+            for key, obj in in_s3.items():
+                entry = in_manifest.get(key)
+                if entry is None:
+                    summary["added"] += 1
+                elif entry.get("etag") != obj["etag"] or entry.get("size") != obj["size"]:
+                    summary["updated"] += 1
+                else:
+                    summary["unchanged"] += 1
+                    continue
+                changed.append(key)
+
+            stale = [key for key in in_manifest if key not in in_s3]
+            summary["removed"] += len(stale)
+
+            if changed or stale:
+                logger.info(
+                    f"media_id={media_id} - Manifest differs from S3: "
+                    f"{len(changed)} objects to record, {len(stale)} entries to remove."
+                )
+            if not dry_run:
+                for key in changed:
+                    mongo.record_artifact(media_id, s3.head_artifact(key))
+                mongo.delete_artifacts(media_id, stale)
+            summary["media"] += 1
+        except Exception as e:
+            logger.error(f"media_id={media_id} - Manifest reconciliation failed: {e}", exc_info=True)
+            summary["failed"].append(media_id)
+
+    if full_run:
+        known = set(media_ids)
+        summary["orphaned"] = [
+            media_id for media_id in (prefix.rstrip("/") for prefix in s3.list_top_level_prefixes())
+            if media_id not in known
+        ]
+        if summary["orphaned"]:
+            logger.warning(f"S3 folders without media in Mongo: {summary['orphaned']}")
+
+    logger.info(f"Manifest reconciliation finished{' (dry run)' if dry_run else ''}: {summary}")
+    return summary
@@ -32,11 +32,13 @@ def process_video(s3_key: str, media_id: str):
 
             logger.info(f"media_id={media_id} - Downloading from S3: {s3_key}")
             s3.download_file(s3_key, local_video)
+            # Uploaded by the browser: recorded in the manifest here
+            mongo.record_artifact(media_id, s3.head_artifact(s3_key))
 
             convert_to_wav(local_video, local_wav, media_id)
 
             logger.info(f"media_id={media_id} - Uploading WAV to S3: {s3_wav_key}")
-            s3.upload_file(local_wav, s3_wav_key)
+            mongo.record_artifact(media_id, s3.upload_file(local_wav, s3_wav_key))
             reporter.report_status_change("conversion completed", {"s3_wav_key": s3_wav_key})
 
             rq.enqueue_audio_processing(
@@ -0,0 +1,233 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ALL_COMPLETED, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from config.settings import get_settings
+from services.mongo import get_mongo_manager, DocumentNotFoundError
+from services.parser import JsonTranscriptParser
+from services.solr import get_solr_manager, SolrManager, split_solr_url, build_media_documents, block_size
+from services.search_cache import bump_index_generation
+
+logger = logging.getLogger(__name__)
+
+# Edits made while the corpus is loaded are re-indexed before the swap, until a pass
+# finds none or after this many passes; a last pass after the swap covers the rest
+CATCH_UP_PASSES = 3
+# Tolerance for clock differences between the API/workers and this process
+CATCH_UP_MARGIN = timedelta(seconds=5)
+PROGRESS_INTERVAL_SECONDS = 10
+
+
+class ParallelLoader:
+    """
+    Buffers documents into chunks and sends them to a core from a thread pool.
+    At most two chunks per thread are in flight, so memory stays bounded.
+    """
+
+    def __init__(self, solr: SolrManager, core: str, workers: int, chunk_size: int):
+        self.solr = solr
+        self.core = core
+        self.chunk_size = chunk_size
+        self.max_pending = workers * 2
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="solr-rebuild")
+        self.local = threading.local()
+        self.buffer: List[Dict[str, Any]] = []
+        self.pending = set()
+        self.sent = 0
+        self.started = time.monotonic()
+
+    def _client(self):
+        # One client (http session) per thread
+        if not hasattr(self.local, "client"):
+            self.local.client = self.solr.client_for_core(self.core)
+        return self.local.client
+
+    def _send(self, docs: List[Dict[str, Any]]) -> int:
+        # No commit per chunk: the rebuild commits once before the swap
+        self._client().add(docs, commit=False)
+        return len(docs)
+
+    def _submit(self, docs: List[Dict[str, Any]]):
+        if len(self.pending) >= self.max_pending:
+            self._collect(FIRST_COMPLETED)
+        self.pending.add(self.executor.submit(self._send, docs))
+
+    def _collect(self, return_when: str):
+        done, self.pending = wait(self.pending, return_when=return_when)
+        for future in done:
+            # Re-raises a failed add
+            self.sent += future.result()
+
+    def add(self, docs: List[Dict[str, Any]]):
+        self.buffer.extend(docs)
+        while len(self.buffer) >= self.chunk_size:
+            self._submit(self.buffer[:self.chunk_size])
+            self.buffer = self.buffer[self.chunk_size:]
+
+    def flush(self):
+        """Sends the buffered documents and waits for all requests in flight."""
+        if self.buffer:
+            self._submit(self.buffer)
+            self.buffer = []
+        self._collect(ALL_COMPLETED)
+
+    def throughput(self) -> float:
+        return self.sent / max(time.monotonic() - self.started, 1e-6)
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def rebuild_solr_corpus(workers: int = None, keep_previous: bool = False) -> Dict[str, Any]:
+    """
+    Blue/green rebuild of the whole Solr index from MongoDB:
+    1.Create a fresh core from the configset (current schema)
+    2.Stream all media from Mongo into it with parallel batched adds
+    3.Catch up with media edited or deleted while loading
+    4.Commit, verify the document count and swap it with the live core
+    5.Catch up once more on the live core with the edits made until the swap
+    Searches keep using the live core until the swap. The previous index stays
+    loaded under the rebuild core name if 'keep_previous' is set (for rollback).
+    """
+    settings = get_settings()
+    solr = get_solr_manager()
+    mongo = get_mongo_manager()
+    parser = JsonTranscriptParser()
+    workers = workers or settings.solr_rebuild_workers
+
+    _, live_core = split_solr_url(solr.solr_url)
+    rebuild_core = f"{live_core}{settings.solr_rebuild_core_suffix}"
+    subtitle_fields = {
+        subtitle_type: mongo.subtitle_field(subtitle_type)
+        for subtitle_type in (settings.type_original, settings.type_translation)
+    }
+
+    # A previous index kept for rollback or a failed rebuild
+    if solr.core_exists(rebuild_core):
+        logger.info(f"Unloading core {rebuild_core} left by a previous rebuild")
+        solr.unload_core(rebuild_core)
+
+    # The cores alternate between two fixed instance dirs: the precreated one
+    # (named like the live core) and the one named like the rebuild core
+    live_instance_dir = solr.core_instance_dir(live_core)
+    instance_dir = live_core if live_instance_dir == rebuild_core else rebuild_core
+    solr.create_core(rebuild_core, instance_dir)
+    rebuild_client = solr.client_for_core(rebuild_core)
+    loader = ParallelLoader(solr, rebuild_core, workers, settings.solr_update_chunk_size)
+
+    doc_counts: Dict[str, int] = {}
+
+    def index_media(media_id: str, target: ParallelLoader):
+        try:
+            metadata = mongo.get_full_metadata(media_id)
+        except DocumentNotFoundError:
+            # Deleted in the meantime
+            doc_counts.pop(media_id, None)
+            return
+        docs = build_media_documents(
+            metadata, subtitle_fields, parser, settings.solr_subtitle_documents, settings.solr_query_time_speakers,
+            settings.solr_debate_parents,
+        )
+        target.add(docs)
+        doc_counts[media_id] = sum(block_size(doc) for doc in docs)
+
+    def catch_up(client, target: ParallelLoader, since: datetime) -> Tuple[int, datetime]:
+        """Re-indexes the media changed since 'since' (their docs are replaced) and drops deleted media."""
+        pass_started_at = datetime.utcnow()
+        changed_ids = mongo.get_media_ids(updated_since=since)
+        if changed_ids:
+            logger.info(f"Rebuild catch-up: re-indexing {len(changed_ids)} media changed in the meantime")
+        for media_id in changed_ids:
+            client.delete(q=f'media_id:"{media_id}"', commit=False)
+            doc_counts.pop(media_id, None)
+            index_media(media_id, target)
+        target.flush()
+
+        deleted_ids = set(doc_counts) - set(mongo.get_media_ids())
+        for media_id in deleted_ids:
+            client.delete(q=f'media_id:"{media_id}"', commit=False)
+            del doc_counts[media_id]
+        return len(changed_ids) + len(deleted_ids), pass_started_at - CATCH_UP_MARGIN
+
+    started_at = datetime.utcnow()
+    try:
+        # 1.Full load
+        media_ids = mongo.get_media_ids()
+        logger.info(f"Rebuilding Solr core {live_core} from {len(media_ids)} media into {rebuild_core}")
+        last_report = time.monotonic()
+        for number, media_id in enumerate(media_ids, 1):
+            index_media(media_id, loader)
+            if time.monotonic() - last_report >= PROGRESS_INTERVAL_SECONDS:
+                logger.info(
+                    f"Rebuild progress: {number}/{len(media_ids)} media, "
+                    f"{loader.sent} docs sent, {loader.throughput():.0f} docs/s"
+                )
+                last_report = time.monotonic()
+        loader.flush()
+
+        # 2.Catch up with edits and deletes made during the load
+        since = started_at - CATCH_UP_MARGIN
+        for _ in range(CATCH_UP_PASSES):
+            changed, since = catch_up(rebuild_client, loader, since)
+            if not changed:
+                break
+        else:
+            logger.info("Rebuild catch-up: media still changing, the remaining edits are indexed after the swap")
+
+        # 3.Commit and verify before going live
+        rebuild_client.commit()
+        indexed = rebuild_client.search("*:*", rows=0).hits
+        expected = sum(doc_counts.values())
+        if indexed != expected:
+            raise RuntimeError(
+                f"Rebuild core {rebuild_core} has {indexed} documents, expected {expected}: not swapped."
+            )
+    except Exception:
+        logger.exception(f"Rebuild failed, live core {live_core} unchanged. Core {rebuild_core} kept for inspection.")
+        raise
+    finally:
+        loader.close()
+
+    solr.swap_cores(live_core, rebuild_core)
+
+    # 4.Edits between the last pass and the swap went to the previous index:
+    # re-index them on the live core, later edits reach it directly
+    live_client = solr.client_for_core(live_core)
+    live_loader = ParallelLoader(solr, live_core, workers, settings.solr_update_chunk_size)
+    try:
+        changed, _ = catch_up(live_client, live_loader, since)
+    finally:
+        live_loader.close()
+    if changed:
+        live_client.commit()
+        bump_index_generation(solr.redis)
+
+    if not keep_previous:
+        solr.unload_core(rebuild_core)
+
+    duration = (datetime.utcnow() - started_at).total_seconds()
+    documents = sum(doc_counts.values())
+    summary = {
+        "media": len(doc_counts),
+        "documents": documents,
+        "seconds": round(duration, 1),
+        "docs_per_second": round(documents / max(duration, 1e-6)),
+        "previous_core": rebuild_core if keep_previous else None,
+    }
+    logger.info(f"Rebuild finished, {rebuild_core} swapped into {live_core}: {summary}")
+    return summary
+
+
+def rollback_solr_rebuild():
+    """Swaps the live core with the previous index kept by a rebuild with keep_previous."""
+    settings = get_settings()
+    solr = get_solr_manager()
+    _, live_core = split_solr_url(solr.solr_url)
+    rebuild_core = f"{live_core}{settings.solr_rebuild_core_suffix}"
+
+    if not solr.core_exists(rebuild_core):
+        raise ValueError(f"No previous index: core {rebuild_core} does not exist.")
+    solr.swap_cores(live_core, rebuild_core)
@@ -1,8 +1,9 @@
 import logging
 from services.s3 import get_s3_manager
-from services.solr import get_solr_manager
+from services.solr import get_solr_manager, debate_fields, build_debate_block
 from services.mongo import get_mongo_manager
 from services.parser import JsonTranscriptParser
+from services.cache import get_metadata_cache
 from config.settings import get_settings
 from services.reporter import JobReporter
 from rq import get_current_job
@@ -39,6 +40,8 @@ def reindex_solr(media_id: str):
 
         # 1.Reset Solr
         solr.delete_by_media_id(media_id)
+        # Block join layout: segments of all types are indexed at the end as one block
+        segment_docs = []
 
         # Helper to Process Each File Type
         def process_transcript_type(key, subtitle_type, is_original):
@@ -57,17 +60,16 @@ def reindex_solr(media_id: str):
             logger.info(segments)
             logger.info(f"Extracted {len(segments)} segments for {subtitle_type}")
 
-            # Save to MongoDB (Segment by Segment)
-            for seg in segments:
-                mongo.save_segments(
-                    media_id=media_id,
-                    segment_nr=seg["segment_nr"],
-                    speaker_id=seg["speaker_id"],
-                    start=seg["start"],
-                    end=seg["end"],
-                    subtitle_type=subtitle_type,
-                    subtitles=seg["subtitles"],
-                )
+            # Save to MongoDB (Bulk upserts)
+            counts = mongo.save_segments_bulk(
+                media_id=media_id,
+                subtitle_type=subtitle_type,
+                segments=segments,
+            )
+            logger.info(
+                f"Saved segments for {subtitle_type}: "
+                f"matched={counts['matched']}, upserted={counts['upserted']}"
+            )
 
             # Extract Speakers
             if is_original:
@@ -77,15 +79,29 @@ def reindex_solr(media_id: str):
             # Index to Solr
             solr_docs = parser.parse(segments, media_id, subtitle_type)
             payload = [doc.model_dump() for doc in solr_docs]
+            if settings.solr_debate_parents:
+                segment_docs.extend(payload)
+                payload = []
+            if settings.solr_subtitle_documents:
+                subtitle_docs = parser.parse_subtitle_documents(segments, media_id, subtitle_type)
+                payload.extend(doc.model_dump() for doc in subtitle_docs)
 
             if payload:
-                solr.client.add(payload, commit=True)
+                solr.add_documents(payload)
                 logger.info(f"Indexed {len(payload)} docs to Solr for {subtitle_type}")
 
         # 2.Parse transcript files and update mongo/solr
         process_transcript_type(subtitles_original_key, settings.type_original, is_original=True)
         process_transcript_type(subtitles_translation_key, settings.type_translation, is_original=False)
 
+        if segment_docs:
+            debate = mongo.get_debate_metadata(media_id)
+            solr.add_documents([build_debate_block(media_id, debate_fields(debate), segment_docs)])
+            logger.info(f"Indexed debate document with {len(segment_docs)} segments to Solr")
+
+        # Segments and speakers were rewritten: drop cached metadata of this process
+        get_metadata_cache().invalidate(media_id)
+
         # 3.Finish reporting status
         reporter.report_status_change(f"{task_type}_completed")
         logger.info(f"{task_type} task finished for {media_id}")
@@ -46,6 +46,8 @@ def process_transcription(s3_key, media_id):
             logger.info(f"media_id={media_id} - Downloading from S3: {s3_key}")
             s3.download_file(s3_key, local_input_path)
             logger.info(f"media_id={media_id} - Download completed.")
+            # Audio uploaded by the browser is not recorded by a conversion
+            mongo.record_artifact(media_id, s3.head_artifact(s3_key))
 
             # 2. Runs Whisper (Transcribe + Translate)
             transcription_files = whisper_service.run_inference(
@@ -81,7 +83,7 @@ def process_transcription(s3_key, media_id):
                     local_path = file_set.get(key_name)
                     if local_path and os.path.exists(local_path):
                         s3_dest = f"{s3_base_path}/{s3_filename}"
-                        s3.upload_file(local_path, s3_dest)
+                        mongo.record_artifact(media_id, s3.upload_file(local_path, s3_dest))
                         uploaded_keys[s3_filename] = s3_dest
 
             process_uploads(transcription_files, "original")
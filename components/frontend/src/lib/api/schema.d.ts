@@ -334,7 +334,9 @@ export interface components {
       /** Items */
       items: components["schemas"]["MediaListItem"][]
       /** Total */
-      total: number
+      total?: number | null
+      /** Next Cursor */
+      next_cursor?: string | null
     }
     /**
      * MediaType
@@ -524,6 +526,16 @@ export interface components {
        * @default []
        */
       subtitles_translation: components["schemas"]["Subtitle"][]
+      /**
+       * Version Original
+       * @default 0
+       */
+      version_original: number
+      /**
+       * Version Translation
+       * @default 0
+       */
+      version_translation: number
     }
     /** Speaker */
     Speaker: {
@@ -608,6 +620,25 @@ export interface components {
       /** Subtitles */
       subtitles: components["schemas"]["Subtitle"][]
       subtitle_type: components["schemas"]["SubtitleType"]
+      /**
+       * Expected Version
+       * @description Edit version of the segment subtitles as loaded, to detect concurrent edits
+       */
+      expected_version?: number | null
+    }
+    /** UpdateSubtitlesResponse */
+    UpdateSubtitlesResponse: {
+      /** Status */
+      status: string
+      /** Media Id */
+      media_id: string
+      /**
+       * Versions
+       * @default {}
+       */
+      versions: {
+        [key: string]: number
+      }
     }
     /** ValidationError */
     ValidationError: {
@@ -809,7 +840,7 @@ export interface operations {
           [name: string]: unknown
         }
         content: {
-          "application/json": components["schemas"]["UpdateMetadataResponse"]
+          "application/json": components["schemas"]["UpdateSubtitlesResponse"]
         }
       }
       /** @description Validation Error */
@@ -896,7 +927,16 @@ export interface operations {
   }
   list_media_admin_list_get: {
     parameters: {
-      query?: never
+      query?: {
+        /** @description Number of items per page */
+        limit?: number
+        /** @description Cursor returned as 'next_cursor' by the previous page */
+        cursor?: string | null
+        /** @description Only return media with this status */
+        status?: string | null
+        /** @description Number of most recent processing steps to return */
+        history_limit?: number
+      }
       header?: never
       path?: never
       cookie?: never
@@ -912,6 +952,15 @@ export interface operations {
           "application/json": components["schemas"]["MediaListResponse"]
         }
       }
+      /** @description Validation Error */
+      422: {
+        headers: {
+          [name: string]: unknown
+        }
+        content: {
+          "application/json": components["schemas"]["HTTPValidationError"]
+        }
+      }
     }
   }
   delete_media_admin_delete_post: {
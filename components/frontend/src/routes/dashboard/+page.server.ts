@@ -5,29 +5,40 @@ import { logger } from "$lib/utils/logger"
 import type { components } from "$lib/api/schema"
 type MediaListItem = components["schemas"]["MediaListItem"]
 
-export const load: PageServerLoad = async ({ fetch }) => {
+// Items per page: more are requested with "Load more" (next_cursor)
+const PAGE_SIZE = 50
+
+export const load: PageServerLoad = async ({ fetch, url }) => {
+  // Status filter from the url, applied by the API
+  const status = url.searchParams.get("status") || null
+
   const { data, error } = await client.GET("/admin/list", {
+    params: { query: { limit: PAGE_SIZE, status } },
     fetch: fetch,
   })
 
   if (error || !data) {
     console.error("Load Error:", error)
     return {
-      items: [],
+      items: [] as MediaListItem[],
+      nextCursor: null,
+      total: null,
+      status,
+      pageSize: PAGE_SIZE,
       error:
         (error as any)?.detail ||
         "System Unavailable: Unable to fetch media list.",
     }
   }
 
-  const sortedItems = (data.items || []).sort(
-    (a: MediaListItem, b: MediaListItem) =>
-      new Date(b.created_at ?? 0).getTime() -
-      new Date(a.created_at ?? 0).getTime(),
-  )
-
+  // Newest first, as sorted by the API
   return {
-    items: sortedItems,
+    items: data.items || [],
+    nextCursor: data.next_cursor ?? null,
+    total: data.total ?? null,
+    status,
+    pageSize: PAGE_SIZE,
+    error: undefined,
   }
 }
 
@@ -0,0 +1,7 @@
+# Sourced by the Solr image before start (docker-entrypoint-initdb.d).
+# Cores created over the CoreAdmin API (blue/green index rebuilds) resolve their
+# configSet in $SOLR_HOME/configsets, which lives on the volume: refresh it from
+# the image on every start, so a rebuilt core picks up the current schema.
+mkdir -p "${SOLR_HOME:-/var/solr/data}/configsets"
+rm -rf "${SOLR_HOME:-/var/solr/data}/configsets/debates"
+cp -r /opt/solr/server/solr/configsets/debates "${SOLR_HOME:-/var/solr/data}/configsets/debates"